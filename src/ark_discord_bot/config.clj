@@ -2,17 +2,27 @@
     "Configuration management for the ARK Discord Bot.
    Reads configuration from environment variables.")
 
+(defn- env-value
+  "Look up key in an environment map, falling back to default."
+  [env key default]
+  (or (get env key) default))
+
+(defn- env-required
+  "Look up key in an environment map. Throws if not set."
+  [env key]
+  (or (get env key)
+      (throw (ex-info (str "Required env var not set: " key)
+                      {:key key}))))
+
 (defn get-env
   "Get environment variable with optional default value."
   ([key] (get-env key nil))
-  ([key default] (or (System/getenv key) default)))
+  ([key default] (env-value (System/getenv) key default)))
 
 (defn get-required-env
   "Get required environment variable. Throws if not set."
   [key]
-  (or (System/getenv key)
-      (throw (ex-info (str "Required env var not set: " key)
-                      {:key key}))))
+  (env-required (System/getenv) key))
 
 (defn parse-int
   "Parse string to integer with optional default."
@@ -34,50 +44,54 @@
       :failure-threshold 3
       :log-level "INFO"})
 
+(defn- env-int
+  "Look up key in an environment map and parse it as an integer."
+  [env key default]
+  (parse-int (get env key) default))
+
 (defn- load-discord-config
   "Load Discord-related configuration."
-  []
-  {:discord-token (get-required-env "DISCORD_BOT_TOKEN")
-   :discord-channel-id (get-required-env "DISCORD_CHANNEL_ID")})
+  [env]
+  {:discord-token (env-required env "DISCORD_BOT_TOKEN")
+   :discord-channel-id (env-required env "DISCORD_CHANNEL_ID")})
 
 (defn- load-k8s-config
   "Load Kubernetes-related configuration."
-  []
-  {:k8s-namespace (get-env "KUBERNETES_NAMESPACE"
-                           (:k8s-namespace default-config))
-   :k8s-deployment (get-env "KUBERNETES_DEPLOYMENT_NAME"
-                            (:k8s-deployment default-config))
-   :k8s-service (get-env "KUBERNETES_SERVICE_NAME"
-                         (:k8s-service default-config))})
+  [env]
+  {:k8s-namespace (env-value env "KUBERNETES_NAMESPACE"
+                             (:k8s-namespace default-config))
+   :k8s-deployment (env-value env "KUBERNETES_DEPLOYMENT_NAME"
+                              (:k8s-deployment default-config))
+   :k8s-service (env-value env "KUBERNETES_SERVICE_NAME"
+                           (:k8s-service default-config))})
 
 (defn- load-rcon-config
   "Load RCON-related configuration."
-  []
-  {:rcon-host (get-env "RCON_HOST" (:rcon-host default-config))
-   :rcon-port (parse-int (get-env "RCON_PORT")
-                         (:rcon-port default-config))
-   :rcon-password (get-required-env "RCON_PASSWORD")
-   :rcon-timeout (parse-int (get-env "RCON_TIMEOUT")
-                            (:rcon-timeout default-config))})
+  [env]
+  {:rcon-host (env-value env "RCON_HOST" (:rcon-host default-config))
+   :rcon-port (env-int env "RCON_PORT" (:rcon-port default-config))
+   :rcon-password (env-required env "RCON_PASSWORD")
+   :rcon-timeout (env-int env "RCON_TIMEOUT" (:rcon-timeout default-config))})
 
 (defn- load-monitor-config
   "Load monitoring-related configuration."
-  []
+  [env]
   (let [default-interval-sec (/ (:monitor-interval default-config) 1000)]
-    {:monitor-interval (* 1000 (parse-int (get-env "MONITORING_INTERVAL")
-                                          default-interval-sec))
-     :failure-threshold (parse-int (get-env "FAILURE_THRESHOLD")
-                                   (:failure-threshold default-config))
-     :log-level (get-env "LOG_LEVEL" (:log-level default-config))}))
+    {:monitor-interval (* 1000 (env-int env "MONITORING_INTERVAL" default-interval-sec))
+     :failure-threshold (env-int env "FAILURE_THRESHOLD"
+                                 (:failure-threshold default-config))
+     :log-level (env-value env "LOG_LEVEL" (:log-level default-config))}))
 
 (defn load-config
   "Load configuration from environment variables.
-   Environment variable names match the Python implementation."
-  []
-  (merge (load-discord-config)
-         (load-k8s-config)
-         (load-rcon-config)
-         (load-monitor-config)))
+   Environment variable names match the Python implementation.
+   The environment is read once; pass a map to load from it instead."
+  ([] (load-config (System/getenv)))
+  ([env]
+   (merge (load-discord-config env)
+          (load-k8s-config env)
+          (load-rcon-config env)
+          (load-monitor-config env))))
 
 (defn validate-config
   "Validate configuration. Returns config or throws on error."
@@ -5,49 +5,57 @@
 (def ^:private command-pattern #"(?i)^!ark\s+(\w+)(?:\s+(.*))?$")
 
 (def ^:private commands
-     #{"help" "status" "players" "restart"})
+     {"help" :help "status" :status "players" :players "restart" :restart})
 
 (defn parse-command
   "Parse a message for !ark commands.
    Returns {:command :keyword :args [args]} or nil."
   [message]
   (when-let [[_ cmd args] (re-matches command-pattern message)]
-    (let [cmd-lower (str/lower-case cmd)]
-      (when (commands cmd-lower)
-        {:command (keyword cmd-lower)
-         :args (when args (str/split (str/trim args) #"\s+"))}))))
+    (when-let [command (commands (str/lower-case cmd))]
+      {:command command
+       :args (when args (str/split (str/trim args) #"\s+"))})))
+
+(def ^:private help-text
+     (str "**🦕 ARKサーバー管理コマンド**\n\n"
+          "`!ark help` - このヘルプメッセージを表示\n"
+          "`!ark status` - 現在のサーバーステータスを確認\n"
+          "`!ark restart` - ARKサーバーを再起動\n"
+          "`!ark players` - 現在オンラインのプレイヤー一覧を表示\n\n"
+          "**📋 使用例:**\n"
+          "• `!ark status` - サーバーが稼働中か確認\n"
+          "• `!ark players` - オンラインプレイヤーを確認\n"
+          "• `!ark restart` - サーバーを再起動（注意して使用）\n\n"
+          "**ℹ️ 注意:** サーバー再起動は完了まで数分かかる場合があります。"))
 
 (defn format-help
   "Format help message."
   []
-  (str "**🦕 ARKサーバー管理コマンド**\n\n"
-       "`!ark help` - このヘルプメッセージを表示\n"
-       "`!ark status` - 現在のサーバーステータスを確認\n"
-       "`!ark restart` - ARKサーバーを再起動\n"
-       "`!ark players` - 現在オンラインのプレイヤー一覧を表示\n\n"
-       "**📋 使用例:**\n"
-       "• `!ark status` - サーバーが稼働中か確認\n"
-       "• `!ark players` - オンラインプレイヤーを確認\n"
-       "• `!ark restart` - サーバーを再起動（注意して使用）\n\n"
-       "**ℹ️ 注意:** サーバー再起動は完了まで数分かかる場合があります。"))
+  help-text)
+
+(defn- append-player
+  "Append one player line to the builder."
+  [^StringBuilder sb player]
+  (-> sb (.append "\n• ") (.append (str (:name player)))))
 
 (defn format-players
   "Format player list."
   [players]
   (if (empty? players)
     "🏝️ 現在オンラインのプレイヤーはいません。"
-    (str "👥 **現在" (count players) "人のプレイヤーがオンライン:**\n"
-         (->> players
-              (map #(str "• " (:name %)))
-              (str/join "\n")))))
+    (let [header (str "👥 **現在" (count players) "人のプレイヤーがオンライン:**")]
+      (str (reduce append-player (StringBuilder. header) players)))))
+
+(def ^:private restart-confirm-text
+     (str "⚠️ **ARKサーバー再起動の確認**\n\n"
+          "本当にARKサーバーを再起動しますか？\n\n"
+          "⚠️ **注意**: 再起動中はプレイヤーが切断され、"
+          "サーバーが再度利用可能になるまで数分かかります。"))
 
 (defn format-restart-confirm
   "Format restart confirmation message."
   []
-  (str "⚠️ **ARKサーバー再起動の確認**\n\n"
-       "本当にARKサーバーを再起動しますか？\n\n"
-       "⚠️ **注意**: 再起動中はプレイヤーが切断され、"
-       "サーバーが再度利用可能になるまで数分かかります。"))
+  restart-confirm-text)
 
 (defn format-restart-started
   "Format restart started message."
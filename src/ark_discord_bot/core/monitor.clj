@@ -7,6 +7,7 @@
   [failure-threshold]
   {:last-status nil
    :failure-count 0
+   :stable-count 0
    :failure-threshold failure-threshold})
 
 (defn should-notify?
@@ -30,6 +31,13 @@
     :else
     (= failure-count (:failure-threshold state))))
 
+(defn- next-stable-count
+  "Count consecutive running checks; any other status resets it."
+  [state new-status]
+  (if (= :running new-status (:last-status state))
+    (inc (:stable-count state 0))
+    0))
+
 (defn update-state
   "Update monitor state with new status."
   [state new-status]
@@ -40,7 +48,8 @@
                     (inc (:failure-count state)))]
     (assoc state
            :last-status new-status
-           :failure-count new-count)))
+           :failure-count new-count
+           :stable-count (next-stable-count state new-status))))
 
 (defn projected-failure-count
   "Calculate projected failure count for the next state.
@@ -51,6 +60,25 @@
       0
       (inc (:failure-count state)))))
 
+(def ^:private max-interval-ms
+     "Upper bound for the adaptive polling interval (5 minutes)."
+     300000)
+
+(def ^:private max-backoff-steps 4)
+
+(defn next-interval
+  "Polling interval for the next monitor cycle.
+   Doubles with each consecutive running check (up to 16x base-ms,
+   capped at max-interval-ms) and drops back to base-ms on any change."
+  [state base-ms]
+  (let [factor (bit-shift-left 1 (min (:stable-count state 0) max-backoff-steps))]
+    (max base-ms (min (* base-ms factor) max-interval-ms))))
+
+(defn reset-backoff
+  "Drop back to the base polling interval, e.g. after a restart request."
+  [state]
+  (assoc state :stable-count 0))
+
 (defn increment-failure
   "Increment failure count."
   [state]
@@ -61,34 +89,20 @@
   [state]
   (assoc state :failure-count 0))
 
-(defn- recovery-notification?
-  "Check if this is a recovery to running state."
-  [current previous]
-  (and (= current :running)
-       (not= previous :running)))
+(def ^:private transition-notifications
+     "Messages for specific [current previous] pairs; nil suppresses."
+     {[:running :running] nil
+      [:starting :not-ready] "🟡 ARKサーバーポッドが稼働中、ゲームサーバー起動中..."
+      [:not-ready :running] "🟡 ARKサーバーが再起動中または準備未完了です..."
+      [:starting :running] "🟡 ARKサーバーが再起動中または準備未完了です..."})
 
-(defn- starting-notification?
-  "Check if server is transitioning to starting state."
-  [current previous]
-  (and (= current :starting)
-       (= previous :not-ready)))
-
-(defn- degraded-notification?
-  "Check if server degraded from running state."
-  [current previous]
-  (and (#{:not-ready :starting} current)
-       (= previous :running)))
+(def ^:private status-notifications
+     "Messages for a current status regardless of the previous one."
+     {:running "🟢 ARKサーバーが接続準備完了しました！ 🦕"
+      :error "🔴 ARKサーバーでエラーが発生しました！ログを確認してください。"})
 
 (defn format-notification
   "Format status change notification message."
   [current-status previous-status]
-  (cond
-    (recovery-notification? current-status previous-status)
-    "🟢 ARKサーバーが接続準備完了しました！ 🦕"
-    (starting-notification? current-status previous-status)
-    "🟡 ARKサーバーポッドが稼働中、ゲームサーバー起動中..."
-    (degraded-notification? current-status previous-status)
-    "🟡 ARKサーバーが再起動中または準備未完了です..."
-    (= current-status :error)
-    "🔴 ARKサーバーでエラーが発生しました！ログを確認してください。"
-    :else nil))
+  (get transition-notifications [current-status previous-status]
+       (get status-notifications current-status)))
@@ -13,10 +13,23 @@
       :warning 0xFFFF00
       :info 0x3498DB})
 
+(defn- channel-messages-path
+  "Build the messages endpoint path for a channel."
+  [channel-id]
+  (str "/channels/" channel-id "/messages"))
+
 (defn create-client
-  "Create a Discord client configuration."
+  "Create a Discord client configuration.
+   The default channel's messages path is resolved once here."
   [token channel-id]
-  {:token token :channel-id channel-id})
+  {:token token :channel-id channel-id
+   :messages-path (channel-messages-path channel-id)})
+
+(defn- messages-path
+  "Messages endpoint path, reusing the cached one for the default channel."
+  [client channel-id]
+  (or (when (= channel-id (:channel-id client)) (:messages-path client))
+      (channel-messages-path channel-id)))
 
 (defn build-embed
   "Build a Discord embed object."
@@ -25,15 +38,17 @@
    :description description
    :color (get embed-colors embed-type 0x3498DB)})
 
+(def ^:private status-messages
+     {:running "🟢 ARKサーバーは稼働中で接続準備完了です！"
+      :starting "🟡 ARKサーバーポッドは稼働中ですが、ゲームサーバーはまだ起動中です。もう少しお待ちください..."
+      :not-ready "🟡 ARKサーバーは起動中または準備未完了です..."
+      :error "🔴 ARKサーバーでエラーが発生しました！ログを確認してください。"})
+
 (defn format-status
   "Format server status for display."
   [status]
-  (case status
-    :running "🟢 ARKサーバーは稼働中で接続準備完了です！"
-    :starting "🟡 ARKサーバーポッドは稼働中ですが、ゲームサーバーはまだ起動中です。もう少しお待ちください..."
-    :not-ready "🟡 ARKサーバーは起動中または準備未完了です..."
-    :error "🔴 ARKサーバーでエラーが発生しました！ログを確認してください。"
-    (str "❓ 不明なサーバーステータス: " (name status))))
+  (or (get status-messages status)
+      (str "❓ 不明なサーバーステータス: " (name status))))
 
 (defn- send-request-impl
   "Send HTTP request to Discord API (synchronous implementation)."
@@ -60,7 +75,7 @@
    (send-message client content (:channel-id client)))
   ([client content channel-id]
    (send-request client :post
-                 (str "/channels/" channel-id "/messages")
+                 (messages-path client channel-id)
                  {:content content})))
 
 (defn send-embed
@@ -70,7 +85,7 @@
    (send-embed client embed (:channel-id client)))
   ([client embed channel-id]
    (send-request client :post
-                 (str "/channels/" channel-id "/messages")
+                 (messages-path client channel-id)
                  {:embeds [embed]})))
 
 (defn send-status-message
@@ -84,28 +99,34 @@
                             (if (= :running status) :success :warning))]
      (send-embed client embed channel-id))))
 
-(defn- build-confirmation-embed
-  "Build the confirmation embed for restart."
-  []
-  {:title "⚠️ ARKサーバー再起動の確認"
-   :description (str "本当にARKサーバーを再起動しますか？\n\n"
-                     "⚠️ **注意**: 再起動中はプレイヤーが切断され、"
-                     "サーバーが再度利用可能になるまで数分かかります。")
-   :color 0xFF9900})
-
-(defn- build-restart-buttons
-  "Build the restart confirmation buttons."
-  []
-  [{:type 2 :style 4 :label "再起動する"
-    :emoji {:name "🔄"} :custom_id "restart_confirm"}
-   {:type 2 :style 2 :label "キャンセル"
-    :emoji {:name "❌"} :custom_id "restart_cancel"}])
+(def ^:private confirmation-embed
+     {:title "⚠️ ARKサーバー再起動の確認"
+      :description (str "本当にARKサーバーを再起動しますか？\n\n"
+                        "⚠️ **注意**: 再起動中はプレイヤーが切断され、"
+                        "サーバーが再度利用可能になるまで数分かかります。")
+      :color 0xFF9900})
+
+(def ^:private restart-buttons
+     [{:type 2 :style 4 :label "再起動する"
+       :emoji {:name "🔄"} :custom_id "restart_confirm"}
+      {:type 2 :style 2 :label "キャンセル"
+       :emoji {:name "❌"} :custom_id "restart_cancel"}])
+
+(def ^:private disabled-restart-buttons
+     (mapv #(assoc % :disabled true) restart-buttons))
+
+(def ^:private restart-confirmation
+     {:embed confirmation-embed
+      :components [{:type 1 :components restart-buttons}]})
+
+(def ^:private restart-confirmation-body
+     {:embeds [confirmation-embed]
+      :components (:components restart-confirmation)})
 
 (defn build-restart-confirmation
   "Build restart confirmation embed with buttons."
   []
-  {:embed (build-confirmation-embed)
-   :components [{:type 1 :components (build-restart-buttons)}]})
+  restart-confirmation)
 
 (defn build-interaction-response
   "Build interaction response payload."
@@ -113,20 +134,12 @@
   {:type response-type
    :data {:content content}})
 
-(defn- build-disabled-restart-buttons
-  "Build disabled restart buttons for interaction update."
-  []
-  [{:type 2 :style 4 :label "再起動する" :emoji {:name "🔄"}
-    :custom_id "restart_confirm" :disabled true}
-   {:type 2 :style 2 :label "キャンセル" :emoji {:name "❌"}
-    :custom_id "restart_cancel" :disabled true}])
-
 (defn build-interaction-update
   "Build interaction update message response with disabled buttons."
   [content]
   {:type 7  ;; UPDATE_MESSAGE
    :data {:content content
-          :components [{:type 1 :components (build-disabled-restart-buttons)}]}})
+          :components [{:type 1 :components disabled-restart-buttons}]}})
 
 (defn send-restart-confirmation
   "Send restart confirmation with buttons.
@@ -134,10 +147,9 @@
   ([client]
    (send-restart-confirmation client (:channel-id client)))
   ([client channel-id]
-   (let [{:keys [embed components]} (build-restart-confirmation)]
-     (send-request client :post
-                   (str "/channels/" channel-id "/messages")
-                   {:embeds [embed] :components components}))))
+   (send-request client :post
+                 (messages-path client channel-id)
+                 restart-confirmation-body)))
 
 (defn respond-to-interaction
   "Respond to a Discord interaction. Returns a channel.
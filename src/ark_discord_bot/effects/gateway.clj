@@ -4,7 +4,8 @@
 
    State-based API: All functions accept an explicit state atom for
    managing gateway state, enabling proper lifecycle management with Integrant."
-    (:require [babashka.http-client.websocket :as ws]
+    (:require [ark-discord-bot.log :refer [log]]
+              [babashka.http-client.websocket :as ws]
               [cheshire.core :as json]
               [clojure.core.async :as async :refer [go go-loop <! alt! timeout]]))
 
@@ -86,6 +87,18 @@
   (min reconnect-max-delay-ms
        (* reconnect-initial-delay-ms (bit-shift-left 1 attempt))))
 
+(def ^:private reconnect-jitter-ratio
+     "Largest random fraction of the backoff added to a scheduled reconnect."
+     0.1)
+
+(defn jittered-backoff
+  "Backoff for attempt plus up to 10% random jitter, so reconnects after a
+   shared outage are spread out. r in [0, 1) defaults to (rand)."
+  ([attempt] (jittered-backoff attempt (rand)))
+  ([attempt r]
+   (let [delay-ms (calculate-backoff attempt)]
+     (+ delay-ms (long (* delay-ms reconnect-jitter-ratio r))))))
+
 (defn wait-ms
   "Wait for specified milliseconds. Mockable for testing."
   [ms]
@@ -182,7 +195,7 @@
 ;; WebSocket handlers that push to channels
 
 (defn- create-on-open-handler []
-  (fn [_ws] (println "[info] [gateway] WebSocket connection established")))
+  (fn [_ws] (log :info "[gateway] WebSocket connection established")))
 
 (defn- process-complete-message [ws-events-chan msg-buffer]
   (let [full-msg @msg-buffer
@@ -198,16 +211,16 @@
         (process-complete-message ws-events-chan msg-buffer)
         (catch Exception e
           (reset! msg-buffer "")
-          (println (str "[error] [gateway] Parse error: " (.getMessage e))))))))
+          (log :error (str "[gateway] Parse error: " (.getMessage e))))))))
 
 (defn- create-on-close-handler [ws-events-chan]
   (fn [_ws code reason]
-    (println (str "[info] [gateway] Connection closed: code=" code ", reason=" reason))
+    (log :info (str "[gateway] Connection closed: code=" code ", reason=" reason))
     (async/put! ws-events-chan {:type :close :code code :reason reason})))
 
 (defn- create-on-error-handler [ws-events-chan]
   (fn [_ws error]
-    (println (str "[error] [gateway] WebSocket error: " (.getMessage error)))
+    (log :error (str "[gateway] WebSocket error: " (.getMessage error)))
     (async/put! ws-events-chan {:type :error :error error})))
 
 (defn- create-ws-handlers [ws-events-chan msg-buffer]
@@ -224,7 +237,7 @@
   (try
     (send-fn ws-client (build-heartbeat (get-gateway-seq-with-state state-atom)))
     (catch Exception e
-      (println (str "[error] [gateway] Heartbeat send failed: " (.getMessage e))))))
+      (log :error (str "[gateway] Heartbeat send failed: " (.getMessage e))))))
 
 (defn- should-continue-heartbeat-with-state? [alt-result state-atom]
   (and (not= :control (first alt-result))
@@ -256,7 +269,7 @@
   "Handle HELLO opcode - identify and start heartbeat."
   [ws-client token data heartbeat-control-chan state-atom]
   (let [interval (:heartbeat_interval data)]
-    (println (str "[debug] [gateway] HELLO received, interval=" interval "ms"))
+    (log :debug (str "[gateway] HELLO received, interval=" interval "ms"))
     (send-json ws-client (build-identify token))
     (start-heartbeat-loop-with-state ws-client interval heartbeat-control-chan
                                      send-json state-atom)))
@@ -264,7 +277,7 @@
 (defn- handle-invalid-session-with-state
   "Handle INVALID_SESSION opcode."
   [state-atom]
-  (println "[error] [gateway] Invalid session - check bot token")
+  (log :error "[gateway] Invalid session - check bot token")
   (set-gateway-running-with-state! state-atom false))
 
 (defn- handle-heartbeat-request-with-state
@@ -275,13 +288,13 @@
 (defn- handle-reconnect
   "Handle RECONNECT opcode - close connection."
   [ws-client]
-  (println "[warn] [gateway] Server requested reconnect")
-  (println "[info] [gateway] Closing connection for reconnect...")
+  (log :warn "[gateway] Server requested reconnect")
+  (log :info "[gateway] Closing connection for reconnect...")
   (close-ws! ws-client))
 
 (defn- log-gateway-message [op event-type]
-  (println (str "[debug] [gateway] Received: op=" (opcode-name op)
-                (when event-type (str ", event=" event-type)))))
+  (log :debug (str "[gateway] Received: op=" (opcode-name op)
+                   (when event-type (str ", event=" event-type)))))
 
 ;; Dispatch by opcode
 (defn- dispatch-by-opcode-with-state
@@ -309,8 +322,8 @@
 (declare establish-websocket)
 
 (defn- log-reconnect-start [delay-ms attempt]
-  (println (str "[info] [gateway] Reconnecting in " delay-ms "ms (attempt "
-                (inc attempt) ")...")))
+  (log :info (str "[gateway] Reconnecting in " delay-ms "ms (attempt "
+                  (inc attempt) ")...")))
 
 (defn- create-reconnect-ws [channels]
   (let [msg-buffer (atom "")
@@ -321,7 +334,7 @@
                    :on-error (:on-error ws-handlers)})))
 
 (defn- log-reconnect-failure [e]
-  (println (str "[error] [gateway] Reconnect failed: " (type e) " - " (.getMessage e))))
+  (log :error (str "[gateway] Reconnect failed: " (type e) " - " (.getMessage e))))
 
 (declare schedule-reconnect-with-state)
 
@@ -329,7 +342,7 @@
   (set-ws-client-with-state! state-atom ws-client)
   (start-event-loop-with-state ws-client token (:ws-events channels) (:control channels)
                                (:heartbeat channels) (:app-events channels) state-atom)
-  (println "[info] [gateway] Reconnection initiated successfully"))
+  (log :info "[gateway] Reconnection initiated successfully"))
 
 (defn- do-reconnect-attempt-with-state [token channels attempt state-atom]
   (try
@@ -343,11 +356,11 @@
 (defn schedule-reconnect-with-state [token channels attempt state-atom]
   (go
     (when (gateway-running-with-state? state-atom)
-      (let [delay-ms (calculate-backoff attempt)]
+      (let [delay-ms (jittered-backoff attempt)]
         (log-reconnect-start delay-ms attempt)
         (<! (timeout delay-ms))
         (when (gateway-running-with-state? state-atom)
-          (println "[debug] [gateway] Attempting reconnection...")
+          (log :debug "[gateway] Attempting reconnection...")
           (do-reconnect-attempt-with-state token channels attempt state-atom))))))
 
 (defn- attempt-reconnect-sync-with-state [token channels state-atom]
@@ -366,7 +379,7 @@
         (log-reconnect-start delay-ms current-attempt)
         (wait-ms delay-ms)
         (when (gateway-running-with-state? state-atom)
-          (println "[debug] [gateway] Attempting reconnection...")
+          (log :debug "[gateway] Attempting reconnection...")
           (let [result (attempt-reconnect-sync-with-state token channels state-atom)]
             (when (= result :failure) (recur (inc current-attempt)))))))))
 
@@ -379,7 +392,7 @@
       (and (= :control (first [event ch])) (= :shutdown (second [event ch])))))
 
 (defn- handle-event-loop-shutdown [heartbeat-control-chan]
-  (println "[info] [gateway] Event loop stopping...")
+  (log :info "[gateway] Event loop stopping...")
   (async/put! heartbeat-control-chan :stop))
 
 (defn- drain-and-close-chan [chan]
@@ -463,12 +476,12 @@
     channels))
 
 (defn- handle-connect-error [e channels]
-  (println (str "[error] [gateway] Failed to connect: " (.getMessage e)))
+  (log :error (str "[gateway] Failed to connect: " (.getMessage e)))
   (close-all-channels channels)
   (throw e))
 
 (defn- connect-internal-with-state [token state-atom]
-  (println "[info] [gateway] Connecting to Discord Gateway...")
+  (log :info "[gateway] Connecting to Discord Gateway...")
   (let [channels (create-gateway-channels)]
     (set-gateway-channels-with-state! state-atom channels)
     (reset-gateway-state-with-state! state-atom)
@@ -510,7 +523,7 @@
    3. Closes WebSocket connection
    4. Closes all channels"
   [state-atom]
-  (println "[info] [gateway] Shutting down gateway...")
+  (log :info "[gateway] Shutting down gateway...")
   (set-shutdown-requested-with-state! state-atom true)
   (set-gateway-running-with-state! state-atom false)
   (shutdown-ws-client-with-state state-atom)
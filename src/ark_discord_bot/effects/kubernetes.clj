@@ -1,11 +1,16 @@
 (ns ark-discord-bot.effects.kubernetes
     "Kubernetes API client for managing ARK server deployments.
    All API functions return core.async channels."
-    (:require [babashka.fs :as fs]
+    (:require [ark-discord-bot.log :refer [log]]
+              [ark-discord-bot.single-flight :as single-flight]
+              [babashka.fs :as fs]
               [babashka.http-client :as http]
               [cheshire.core :as json]
               [clojure.core.async :as async]
-              [clojure.string :as str]))
+              [clojure.string :as str])
+    (:import [java.net.http HttpTimeoutException]
+             [java.time Instant]
+             [java.time.temporal ChronoUnit]))
 
 (defn- create-http-client
   "Create HTTP client with SSL context for K8s API.
@@ -18,26 +23,58 @@
     ;; Outside cluster: use default SSL
     nil))
 
+(defn- create-caches
+  "Create the per-client token and deployment status caches, and the slot
+   for an in-flight status request (see single-flight)."
+  []
+  {:token-cache (atom nil)
+   :status-cache (atom nil)
+   :status-inflight (atom nil)})
+
 (defn create-client
-  "Create a Kubernetes client configuration."
+  "Create a Kubernetes client configuration.
+   The HTTP client is a delay so SSL setup happens on the first API call,
+   not on the startup path."
   [namespace deployment service]
   (let [ca-path "/var/run/secrets/kubernetes.io/serviceaccount/ca.crt"]
-    {:namespace namespace
-     :deployment deployment
-     :service service
-     :api-server (or (System/getenv "KUBERNETES_SERVICE_HOST")
-                     "kubernetes.default.svc")
-     :token-path "/var/run/secrets/kubernetes.io/serviceaccount/token"
-     :ca-path ca-path
-     :http-client (create-http-client ca-path)}))
+    (merge {:namespace namespace
+            :deployment deployment
+            :service service
+            :api-server (or (System/getenv "KUBERNETES_SERVICE_HOST")
+                            "kubernetes.default.svc")
+            :token-path "/var/run/secrets/kubernetes.io/serviceaccount/token"
+            :ca-path ca-path
+            :http-client (delay (create-http-client ca-path))}
+           (create-caches))))
 
-(defn- read-token
-  "Read service account token."
+(def ^:private token-refresh-ms
+     "How long a read token is reused before re-reading the file.
+   Kubelet rotates projected tokens long before they expire."
+     60000)
+
+(defn- load-token
+  "Read service account token from disk."
   [client]
   (try
     (str/trim (slurp (:token-path client)))
     (catch Exception _ nil)))
 
+(defn- token-fresh?
+  "Check if a cached token entry is still within the refresh window."
+  [cached now]
+  (and cached (< (- now (:read-at cached)) token-refresh-ms)))
+
+(defn- read-token
+  "Read service account token, re-reading the file at most once per minute."
+  [client]
+  (let [now (System/currentTimeMillis)
+        cached @(:token-cache client)]
+    (if (token-fresh? cached now)
+      (:token cached)
+      (when-let [token (load-token client)]
+        (reset! (:token-cache client) {:token token :read-at now})
+        token))))
+
 (defn- api-url
   "Build Kubernetes API URL."
   [client path]
@@ -66,11 +103,22 @@
     (or (str/includes? body "etcdserver:")
         (str/includes? body "context deadline exceeded"))))
 
+(defn http-client
+  "Get the HTTP client, creating it on first use. Returns nil outside K8s."
+  [client]
+  (some-> (:http-client client) deref))
+
+(def ^:private request-timeout-ms
+     "Upper bound for a single API request, so a hung API server fails the
+   status check instead of blocking the monitor loop indefinitely."
+     5000)
+
 (defn- request-opts
-  "Build request options with optional HTTP client."
+  "Build request options with optional HTTP client and a request timeout."
   [client headers]
-  (cond-> {:headers headers :throw false}
-          (:http-client client) (assoc :client (:http-client client))))
+  (let [shared-client (http-client client)]
+    (cond-> {:headers headers :throw false :timeout request-timeout-ms}
+            shared-client (assoc :client shared-client))))
 
 (defn- get-deployment-status-impl
   "Get deployment status from Kubernetes API (synchronous implementation)."
@@ -83,18 +131,94 @@
       (throw (ex-info "Failed to get deployment"
                       {:status (:status resp) :body (:body resp)})))))
 
+(def ^:private status-cache-ms
+     "How long a deployment status is shared between callers."
+     5000)
+
+(defn- cached-status
+  "Return the cached deployment status if it is still fresh."
+  [client now]
+  (let [cached @(:status-cache client)]
+    (when (and cached (< (- now (:fetched-at cached)) status-cache-ms))
+      (:status cached))))
+
+(def ^:private stale-tolerance-ms
+     "How old a cached status may be and still stand in for a transient
+   API failure. Short enough that a real outage surfaces within a cycle."
+     30000)
+
+(defn- stale-status
+  "Return the cached status if it is within tolerance."
+  [client now]
+  (let [cached @(:status-cache client)]
+    (when (and cached (< (- now (:fetched-at cached)) stale-tolerance-ms))
+      (:status cached))))
+
+(defn- fallback-worthy?
+  "Only etcd hiccups and request timeouts may be masked by a cached
+   status; errors such as 404 or 403 must surface."
+  [e]
+  (or (instance? HttpTimeoutException e)
+      (is-transient-error? e)))
+
+(defn- stale-fallback
+  "Recover from a transient API failure with a recent cached status,
+   rethrowing anything else."
+  [client now ^Exception e]
+  (if-let [stale (when (fallback-worthy? e) (stale-status client now))]
+    (do (log :warn (str "K8s status request failed, using cached status: " (.getMessage e)))
+        stale)
+    (throw e)))
+
+(defn- fetch-deployment-status
+  "Fetch deployment status and store it in the client's cache.
+   A transient API failure falls back to a recent cached status so a
+   brief API blip is not reported as a server problem."
+  [client now]
+  (try
+    (let [status (get-deployment-status-impl client)]
+      (reset! (:status-cache client) {:status status :fetched-at now})
+      status)
+    (catch Exception e
+      (stale-fallback client now e))))
+
+(defn- fetch-unless-cached
+  "Fetch deployment status, unless a fresh one was cached meanwhile."
+  [client force?]
+  (let [now (System/currentTimeMillis)]
+    (or (when-not force? (cached-status client now))
+        (fetch-deployment-status client now))))
+
+(defn- coalesced-status
+  "Share one API call between concurrent misses (see single-flight)."
+  [client force?]
+  (single-flight/run-shared (:status-inflight client) #(fetch-unless-cached client force?)))
+
 (defn get-deployment-status
-  "Get deployment status from Kubernetes API. Returns a channel."
-  [client]
-  (async/thread
-    (get-deployment-status-impl client)))
+  "Get deployment status from Kubernetes API. Returns a channel.
+   Results are cached briefly and concurrent requests are coalesced,
+   so bursts of commands share one API call.
+   Pass {:force? true} to bypass the cache."
+  ([client] (get-deployment-status client {}))
+  ([client {:keys [force?]}]
+   (async/thread
+     (or (when-not force? (cached-status client (System/currentTimeMillis)))
+         (coalesced-status client force?)))))
+
+(defn- restart-timestamp
+  "UTC time (now by default) as an RFC 3339 string with second precision,
+   the same format kubectl rollout restart writes."
+  ([] (restart-timestamp (Instant/now)))
+  ([^Instant instant]
+   (str (.truncatedTo instant ChronoUnit/SECONDS))))
 
 (defn- build-restart-patch
-  "Build patch payload for restarting deployment."
-  []
-  {:spec {:template {:metadata {:annotations
-                                {"kubectl.kubernetes.io/restartedAt"
-                                 (str (java.time.Instant/now))}}}}})
+  "Build patch payload for restarting deployment.
+   The timestamp defaults to now; pass one to get a fixed payload."
+  ([] (build-restart-patch (restart-timestamp)))
+  ([timestamp]
+   {:spec {:template {:metadata {:annotations
+                                 {"kubectl.kubernetes.io/restartedAt" timestamp}}}}}))
 
 (defn- execute-patch
   "Execute PATCH request against Kubernetes API."
@@ -105,12 +229,14 @@
     (http/patch (deployment-url client) opts)))
 
 (defn- restart-deployment-impl
-  "Restart deployment by patching with new annotation (synchronous implementation)."
+  "Restart deployment by patching with new annotation (synchronous implementation).
+   A successful restart drops the cached status, which no longer holds."
   [client]
   (let [token (read-token client)
         resp (execute-patch client token (build-restart-patch))]
     (if (= 200 (:status resp))
-      {:success true}
+      (do (reset! (:status-cache client) nil)
+          {:success true})
       {:error (ex-info "Failed to restart deployment"
                        {:status (:status resp) :body (:body resp)})})))
 
@@ -4,51 +4,108 @@
     (:require [ark-discord-bot.rcon.protocol :as protocol]
               [clojure.core.async :as async]
               [clojure.string :as str])
-    (:import [java.io DataInputStream DataOutputStream]
-             [java.net Socket]))
+    (:import [java.io DataInputStream DataOutputStream EOFException]
+             [java.net InetSocketAddress Socket SocketException]))
 
 (defn create-client
-  "Create an RCON client configuration."
+  "Create an RCON client configuration.
+   :conn holds the persistent connection used by execute-persistent.
+   :status-cache holds the last successful status probe and :status-inflight
+   the promise of a probe in progress (see server-status).
+   The auth packet never changes, so it is packed once here."
   [host port password]
-  {:host host :port port :password password :socket nil})
+  {:host host :port port :password password :socket nil
+   :auth-packet (protocol/pack-packet 1 protocol/SERVERDATA_AUTH password)
+   :conn (atom nil)
+   :status-cache (atom nil)
+   :status-inflight (atom nil)})
 
 (defn connected?
   "Check if client is connected."
   [client]
   (some? (:socket client)))
 
+(def ^:private recv-buffer-size
+     "Receive buffer kept per connection; larger packets get their own array."
+     4096)
+
 (defn- read-response
-  "Read RCON response from input stream."
-  [in]
-  (let [size-bytes (byte-array 4)]
-    (.readFully in size-bytes)
-    (let [size (protocol/read-int-le size-bytes)
-          response-bytes (byte-array size)]
-      (.readFully in response-bytes)
-      (protocol/unpack-response response-bytes))))
+  "Read RCON response from the connection's input stream.
+   The little-endian size prefix is read without allocating, and bodies
+   that fit are read into the connection's reusable buffer."
+  [{:keys [^DataInputStream in ^bytes buf]}]
+  (let [size (Integer/reverseBytes (.readInt in))
+        data (if (<= size (alength buf)) buf (byte-array size))]
+    (.readFully in data 0 size)
+    (protocol/unpack-response data size)))
+
+(def ^:private max-stale-responses
+     "Stray packets skipped before a connection is considered out of step."
+     8)
+
+(defn- write-packet!
+  "Write a packed packet on a connection."
+  [{:keys [^DataOutputStream out]} ^bytes packet]
+  (.write out packet)
+  (.flush out))
 
 (defn- send-packet
-  "Send packet and receive response."
-  [socket request-id packet-type body]
-  (let [out (DataOutputStream. (.getOutputStream socket))
-        in (DataInputStream. (.getInputStream socket))
-        packet (protocol/pack-packet request-id packet-type body)]
-    (.write out packet)
-    (.flush out)
-    (read-response in)))
+  "Send a packed packet on a connection and receive the response."
+  [conn ^bytes packet]
+  (write-packet! conn packet)
+  (read-response conn))
+
+(defn- send-command!
+  "Write a command packet and read the first response. EOF or a socket
+   error here means the server closed the connection before answering,
+   so the failure is marked :closed? for a retry on a fresh connection."
+  [conn ^bytes packet]
+  (try
+    (send-packet conn packet)
+    (catch EOFException e
+      (throw (ex-info "RCON connection closed" {:closed? true} e)))
+    (catch SocketException e
+      (throw (ex-info "RCON connection closed" {:closed? true} e)))))
+
+(defn- read-reply
+  "Starting from resp, read responses until one answers request id,
+   skipping late replies to earlier commands. Throws when too many
+   arrive out of step."
+  [conn id resp]
+  (loop [resp resp skipped 0]
+    (cond
+      (= id (:id resp)) resp
+      (< skipped max-stale-responses) (recur (read-response conn) (inc skipped))
+      :else (throw (ex-info "RCON response id mismatch"
+                            {:expected id :response resp})))))
+
+(defn- open-socket
+  "Open a TCP socket to the RCON server with Nagle disabled.
+   timeout-ms bounds both the connect and each read."
+  [{:keys [host port]} timeout-ms]
+  (doto (Socket.)
+        (.setTcpNoDelay true)
+        (.connect (InetSocketAddress. ^String host (int port)) (int timeout-ms))
+        (.setSoTimeout timeout-ms)))
+
+(defn- open-streams
+  "Wrap a socket's streams once for the lifetime of the connection."
+  [^Socket socket]
+  {:socket socket
+   :in (DataInputStream. (.getInputStream socket))
+   :out (DataOutputStream. (.getOutputStream socket))
+   :buf (byte-array recv-buffer-size)
+   :last-id (atom 1)})
 
 (defn- connect-impl
   "Connect and authenticate to RCON server (synchronous implementation)."
   [client timeout-ms]
-  (let [socket (Socket. (:host client) (:port client))]
-    (.setSoTimeout socket timeout-ms)
-    (let [auth-resp (send-packet socket 1
-                                 protocol/SERVERDATA_AUTH
-                                 (:password client))]
-      (if (= -1 (:id auth-resp))
-        (do (.close socket)
-            (throw (ex-info "RCON auth failed" {:response auth-resp})))
-        (assoc client :socket socket)))))
+  (let [conn (open-streams (open-socket client timeout-ms))
+        auth-resp (send-packet conn (:auth-packet client))]
+    (if (= -1 (:id auth-resp))
+      (do (.close ^Socket (:socket conn))
+          (throw (ex-info "RCON auth failed" {:response auth-resp})))
+      (merge client conn))))
 
 (defn connect
   "Connect and authenticate to RCON server. Returns a channel."
@@ -60,8 +117,8 @@
   "Close RCON connection (synchronous implementation)."
   [client]
   (when-let [socket (:socket client)]
-    (.close socket))
-  (assoc client :socket nil))
+    (.close ^Socket socket))
+  (assoc client :socket nil :in nil :out nil :buf nil :last-id nil))
 
 (defn disconnect
   "Close RCON connection. Returns a channel."
@@ -69,15 +126,35 @@
   (async/thread
     (disconnect-impl client)))
 
+(defn pack-command
+  "Pack a command as an EXECCOMMAND packet. Callers that repeat a command
+   can pack it once and pass the bytes to execute / execute-persistent;
+   the request id is set per send."
+  [command]
+  (protocol/pack-packet 2 protocol/SERVERDATA_EXECCOMMAND command))
+
+(defn- next-request-id!
+  "Take the connection's next command id. Ids grow per connection (auth
+   uses 1), so a late reply to an earlier command never matches."
+  [conn]
+  (swap! (:last-id conn) #(if (< % Integer/MAX_VALUE) (inc %) 2)))
+
+(defn- command-packet
+  "EXECCOMMAND packet for command (a string or pre-packed bytes) with id."
+  [command id]
+  (if (bytes? command)
+    (protocol/with-request-id command id)
+    (protocol/pack-packet id protocol/SERVERDATA_EXECCOMMAND command)))
+
 (defn- execute-impl
-  "Execute RCON command and return response (synchronous implementation)."
+  "Execute RCON command (a string or a pre-packed packet) and return
+   response (synchronous implementation)."
   [client command]
   (when-not (connected? client)
     (throw (ex-info "Not connected" {})))
-  (let [resp (send-packet (:socket client) 2
-                          protocol/SERVERDATA_EXECCOMMAND
-                          command)]
-    (:body resp)))
+  (let [id (next-request-id! client)
+        resp (send-command! client (command-packet command id))]
+    (:body (read-reply client id resp))))
 
 (defn execute
   "Execute RCON command and return response. Returns a channel."
@@ -85,17 +162,79 @@
   (async/thread
     (execute-impl client command)))
 
-(defn- parse-player-line
-  "Parse a single player line from ListPlayers output."
-  [line]
-  (when-let [[_ name steam-id] (re-matches #"\d+\.\s+(.+),\s+(\S+)" line)]
-    {:name (str/trim name) :steam-id steam-id}))
+(defn- open-connection?
+  "Check if a connected client still has an open socket."
+  [conn]
+  (when-let [^Socket socket (:socket conn)]
+    (and (.isConnected socket) (not (.isClosed socket)))))
+
+(defn- ensure-connected!
+  "Return the cached connection, connecting and authenticating if needed."
+  [client timeout-ms]
+  (let [conn @(:conn client)]
+    (if (open-connection? conn)
+      conn
+      (reset! (:conn client) (connect-impl client timeout-ms)))))
+
+(defn- drop-connection!
+  "Close and forget the cached connection."
+  [client]
+  (when-let [conn @(:conn client)]
+    (try (disconnect-impl conn) (catch Exception _)))
+  (reset! (:conn client) nil))
+
+(defn- execute-on-connection!
+  "Execute command on the cached connection, dropping it on failure
+   (including replies that are out of step with the request)."
+  [client command timeout-ms]
+  (try
+    (execute-impl (ensure-connected! client timeout-ms) command)
+    (catch Exception e
+      (drop-connection! client)
+      (throw e))))
+
+(defn- execute-persistent-impl
+  "Execute command, retrying once on a fresh connection when a reused one
+   was closed (e.g. by the server while idle) before answering. Timeouts
+   and other failures are not retried, so a command is never sent twice."
+  [client command timeout-ms]
+  (locking (:conn client)
+           (let [reused? (open-connection? @(:conn client))]
+             (try
+               (execute-on-connection! client command timeout-ms)
+               (catch Exception e
+                 (if (and reused? (:closed? (ex-data e)))
+                   (execute-on-connection! client command timeout-ms)
+                   (throw e)))))))
+
+(defn execute-persistent
+  "Execute RCON command over the client's persistent connection.
+   Connects and authenticates on first use and after failures, so
+   repeated commands skip the TCP handshake and auth round trip.
+   Returns a channel."
+  [client command timeout-ms]
+  (async/thread
+    (execute-persistent-impl client command timeout-ms)))
+
+(defn close!
+  "Close the client's persistent connection, if open."
+  [client]
+  (locking (:conn client)
+           (drop-connection! client)))
+
+(def ^:private player-pattern
+     #"(?m)^\d+\.\h+(.+),\h+(\S+)\h*$")
+
+(defn- match->player
+  "Build a player map from a player-pattern match."
+  [[_ name steam-id]]
+  {:name (str/trim name) :steam-id steam-id})
 
 (defn parse-listplayers
-  "Parse ListPlayers response into player list."
+  "Parse ListPlayers response into player list.
+   Players are extracted in one regex pass over the whole response;
+   \"No Players Connected\" simply has no matching lines."
   [response]
-  (if (or (str/blank? response)
-          (str/includes? response "No Players"))
+  (if (str/blank? response)
     []
-    (->> (str/split-lines response)
-         (keep parse-player-line))))
+    (mapv match->player (re-seq player-pattern response))))
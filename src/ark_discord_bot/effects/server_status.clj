@@ -0,0 +1,109 @@
+(ns ark-discord-bot.effects.server-status
+    "Server status checks shared by the monitor loop and Discord commands.
+   Combines the Kubernetes and RCON clients with core.status."
+    (:require [ark-discord-bot.core.status :as status]
+              [ark-discord-bot.effects.kubernetes :as k8s]
+              [ark-discord-bot.effects.rcon :as rcon]
+              [ark-discord-bot.log :refer [log]]
+              [ark-discord-bot.single-flight :as single-flight]
+              [clojure.core.async :refer [<!!]]))
+
+(defn- take-or-throw
+  "Take a result from an effect channel. async/thread closes the channel
+   without a value when its body throws, so nil means the call failed."
+  [ch what]
+  (let [v (<!! ch)]
+    (if (nil? v)
+      (throw (ex-info (str what " failed") {}))
+      v)))
+
+(def ^:private list-players-packet
+     "ListPlayers runs on every status check, so its packet is packed once."
+     (rcon/pack-command "ListPlayers"))
+
+(defn- fetch-players-via-rcon [rcon-client timeout-ms]
+  (let [response (take-or-throw (rcon/execute-persistent rcon-client list-players-packet
+                                                         timeout-ms)
+                                "RCON ListPlayers")]
+    {:connected true :players (rcon/parse-listplayers response)}))
+
+(defn check-rcon-status
+  "List players over the persistent RCON connection.
+   Returns {:connected true :players [...]} or {:connected false :error msg}."
+  [rcon-client timeout-ms]
+  (try
+    (fetch-players-via-rcon rcon-client timeout-ms)
+    (catch Exception e
+      (log :warn (str "RCON connection failed: " (type e) " - " (.toString e)
+                      " (host=" (:host rcon-client) ", port=" (:port rcon-client) ")"))
+      {:connected false :error (.toString e)})))
+
+(def ^:private rcon-cache-ms
+     "How long a successful RCON probe is shared between callers."
+     5000)
+
+(defn- cached-rcon-status
+  "Return the cached RCON result if it is still fresh."
+  [rcon-client now]
+  (let [cached @(:status-cache rcon-client)]
+    (when (and cached (< (- now (:fetched-at cached)) rcon-cache-ms))
+      (:result cached))))
+
+(defn- fetch-rcon-status
+  "Probe RCON and cache the result when the server answered."
+  [rcon-client timeout-ms now]
+  (let [result (check-rcon-status rcon-client timeout-ms)]
+    (when (:connected result)
+      (reset! (:status-cache rcon-client) {:result result :fetched-at now}))
+    result))
+
+(defn- probe-unless-cached
+  "Probe RCON, unless a fresh result was cached meanwhile."
+  [rcon-client timeout-ms force?]
+  (let [now (System/currentTimeMillis)]
+    (or (when-not force? (cached-rcon-status rcon-client now))
+        (fetch-rcon-status rcon-client timeout-ms now))))
+
+(defn- coalesced-rcon-status
+  "Share one probe between concurrent misses (see single-flight)."
+  [rcon-client timeout-ms force?]
+  (single-flight/run-shared (:status-inflight rcon-client)
+                            #(probe-unless-cached rcon-client timeout-ms force?)))
+
+(defn- rcon-status
+  "RCON probe for check-status, reusing a recent successful result
+   unless force? is set."
+  [rcon-client timeout-ms force?]
+  (or (when-not force? (cached-rcon-status rcon-client (System/currentTimeMillis)))
+      (coalesced-rcon-status rcon-client timeout-ms force?)))
+
+(defn- k8s-status
+  "Deployment status for check-status, or {:error msg} if the request failed."
+  [k8s-client opts]
+  (try
+    (take-or-throw (k8s/get-deployment-status k8s-client opts)
+                   "Deployment status request")
+    (catch Exception e
+      {:error (.getMessage e)})))
+
+(defn- rcon-result
+  "RCON result when the pods are available, taken from the eager probe if
+   one was started. An unneeded eager probe is left to finish and ignored;
+   cancelling it could not interrupt a blocking socket read."
+  [k8s-result eager probe]
+  (when (:available? k8s-result)
+    (if eager @eager (probe))))
+
+(defn check-status
+  "Run the 2-stage status check (K8s, then RCON if pods are available).
+   Options are passed to k8s/get-deployment-status (e.g. {:force? true});
+   :force? also bypasses the short RCON result cache.
+   With :eager-rcon? the RCON probe runs alongside the K8s request and
+   its result is ignored if the pods turn out to be unavailable."
+  ([k8s-client rcon-client config]
+   (check-status k8s-client rcon-client config {}))
+  ([k8s-client rcon-client config opts]
+   (let [probe #(rcon-status rcon-client (:rcon-timeout config) (:force? opts))
+         eager (when (:eager-rcon? opts) (future (probe)))
+         k8s-result (k8s-status k8s-client opts)]
+     (status/determine-status k8s-result (rcon-result k8s-result eager probe)))))
@@ -0,0 +1,27 @@
+(ns ark-discord-bot.log
+    "Asynchronous logging helper.
+   Lines are written to stdout by an agent, so callers (including go
+   blocks and the monitor loop) only enqueue and never block on I/O.")
+
+(def ^:private writer (agent nil))
+
+(defn format-line
+  "Format a log line as [level] msg."
+  [level msg]
+  (str "[" (name level) "] " msg))
+
+(defn- write-line
+  "Agent action that prints a single line."
+  [_ line]
+  (println line))
+
+(defn log
+  "Queue a log message for writing."
+  [level msg]
+  (send-off writer write-line (format-line level msg))
+  nil)
+
+(defn flush!
+  "Wait until queued log lines are written. Returns false on timeout."
+  ([] (flush! 1000))
+  ([timeout-ms] (await-for timeout-ms writer)))
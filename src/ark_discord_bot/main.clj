@@ -1,14 +1,10 @@
 (ns ark-discord-bot.main
     "Main entry point for the ARK Discord Bot.
    Uses Integrant for system lifecycle management."
-    (:require [ark-discord-bot.system :as system])
+    (:require [ark-discord-bot.log :refer [flush! log]]
+              [ark-discord-bot.system :as system])
     (:gen-class))
 
-(defn- log
-  "Simple logging helper."
-  [level msg]
-  (println (str "[" (name level) "] " msg)))
-
 (defn -main
   "Application entry point."
   [& _args]
@@ -18,5 +14,6 @@
                       (Thread. (fn []
                                  (log :info "Shutting down...")
                                  (system/stop! sys)
-                                 (log :info "Shutdown complete."))))
+                                 (log :info "Shutdown complete.")
+                                 (flush!))))
     @(promise)))
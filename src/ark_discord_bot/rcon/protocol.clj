@@ -1,7 +1,8 @@
 (ns ark-discord-bot.rcon.protocol
     "RCON binary protocol implementation.
    Handles packet packing/unpacking with little-endian byte order."
-    (:import [java.nio ByteBuffer ByteOrder]))
+    (:import [java.nio ByteBuffer ByteOrder]
+             [java.nio.charset StandardCharsets]))
 
 ;; RCON packet types
 (def SERVERDATA_AUTH 3)
@@ -12,12 +13,25 @@
 (defn encode-body
   "Encode string body to UTF-8 bytes."
   [body]
-  (.getBytes (str body) "UTF-8"))
+  (.getBytes (str body) StandardCharsets/UTF_8))
+
+(defn- utf8-bom?
+  "Check whether the slice starts with a UTF-8 byte order mark."
+  [^bytes data offset length]
+  (and (>= length 3)
+       (= (unchecked-byte 0xEF) (aget data offset))
+       (= (unchecked-byte 0xBB) (aget data (+ offset 1)))
+       (= (unchecked-byte 0xBF) (aget data (+ offset 2)))))
 
 (defn decode-body
-  "Decode bytes to string, trying multiple encodings."
-  [data]
-  (String. (bytes data) "UTF-8"))
+  "Decode bytes as UTF-8, skipping a leading byte order mark.
+   Malformed sequences become U+FFFD instead of throwing.
+   With offset and length, decodes that slice without copying it."
+  ([data] (decode-body data 0 (alength (bytes data))))
+  ([data offset length]
+   (if (utf8-bom? data offset length)
+     (decode-body data (+ offset 3) (- length 3))
+     (String. (bytes data) (int offset) (int length) StandardCharsets/UTF_8))))
 
 (defn- create-buffer
   "Create a little-endian ByteBuffer of given size."
@@ -42,24 +56,41 @@
     (fill-packet-buffer buffer payload-size request-id packet-type body-bytes)
     (.array buffer)))
 
+(defn with-request-id
+  "Copy a packed packet with its request id replaced."
+  [^bytes packet request-id]
+  (let [copy (aclone packet)]
+    (.putInt (.order (ByteBuffer/wrap copy) ByteOrder/LITTLE_ENDIAN) 4 (int request-id))
+    copy))
+
+(defn- int-le-at
+  "Read a little-endian int at offset without wrapping the array."
+  [^bytes data offset]
+  (let [o (int offset)]
+    (unchecked-int
+     (bit-or (bit-and (aget data o) 0xFF)
+             (bit-shift-left (bit-and (aget data (+ o 1)) 0xFF) 8)
+             (bit-shift-left (bit-and (aget data (+ o 2)) 0xFF) 16)
+             (bit-shift-left (bit-and (aget data (+ o 3)) 0xFF) 24)))))
+
 (defn read-int-le
   "Read little-endian int from 4-byte array."
   [data]
-  (-> (ByteBuffer/wrap data)
-      (.order ByteOrder/LITTLE_ENDIAN)
-      (.getInt)))
+  (int-le-at data 0))
+
+(def ^:private min-response-size
+     "id + type + two null terminators."
+     10)
 
 (defn unpack-response
   "Unpack RCON response from byte array.
-   Returns map with :id, :type, :body keys."
-  [data]
-  (let [buffer (-> (ByteBuffer/wrap data)
-                   (.order ByteOrder/LITTLE_ENDIAN))
-        id (.getInt buffer)
-        type-val (.getInt buffer)
-        body-len (- (count data) 8 2)  ;; total - id - type - nulls
-        body-bytes (byte-array body-len)]
-    (.get buffer body-bytes)
-    {:id id
-     :type type-val
-     :body (decode-body body-bytes)}))
+   Returns map with :id, :type, :body keys.
+   With length, only the first length bytes of data are the packet.
+   The body is decoded in place; throws if data is shorter than a packet."
+  ([^bytes data] (unpack-response data (alength data)))
+  ([^bytes data length]
+   (when (< length min-response-size)
+     (throw (ex-info "RCON response too short" {:size length})))
+   {:id (int-le-at data 0)
+    :type (int-le-at data 4)
+    :body (decode-body data 8 (- length min-response-size))}))
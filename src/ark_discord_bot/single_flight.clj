@@ -0,0 +1,31 @@
+(ns ark-discord-bot.single-flight
+    "Share one in-flight call between concurrent callers.
+   The first caller publishes a promise in an atom and makes the call;
+   later callers wait on that promise. No lock is held across the call.")
+
+(defn- claim
+  "Publish a new in-flight promise unless one exists.
+   Returns [promise owner?]; only the owner makes the call."
+  [inflight]
+  (let [p (promise)
+        current (swap! inflight #(or % p))]
+    [current (identical? current p)]))
+
+(defn- run-owned!
+  "Make the call as owner and deliver its value or exception to waiting
+   callers. The promise is always delivered and the slot released."
+  [inflight p f]
+  (try
+    (deliver p (try {:value (f)} (catch Exception e {:error e})))
+    (finally
+      (deliver p {:error (ex-info "In-flight call did not complete" {})})
+      (reset! inflight nil))))
+
+(defn run-shared
+  "Call f, or wait for the call already in flight in the inflight atom and
+   share its result. An exception thrown by f is rethrown to every caller."
+  [inflight f]
+  (let [[p owner?] (claim inflight)]
+    (when owner? (run-owned! inflight p f))
+    (let [{:keys [value error]} @p]
+      (if error (throw error) value))))
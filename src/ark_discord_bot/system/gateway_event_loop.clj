@@ -5,52 +5,22 @@
               [ark-discord-bot.effects.discord :as discord]
               [ark-discord-bot.effects.gateway :as gateway]
               [ark-discord-bot.effects.kubernetes :as k8s]
-              [ark-discord-bot.effects.rcon :as rcon]
-              [clojure.core.async :as async :refer [go-loop alt! <!!]]
+              [ark-discord-bot.effects.server-status :as server-status]
+              [ark-discord-bot.log :refer [log]]
+              [ark-discord-bot.system.monitor-loop :as monitor-loop]
+              [clojure.core.async :as async :refer [alt!! <!!]]
               [integrant.core :as ig]))
 
-(defn- log [level msg]
-  (println (str "[" (name level) "] " msg)))
-
-(defn- safe-disconnect [client]
-  (when client
-    (try (<!! (rcon/disconnect client)) (catch Exception _))))
-
-(defn- fetch-players-via-rcon [rcon-client timeout-ms]
-  (let [connected-client (<!! (rcon/connect rcon-client timeout-ms))]
-    (try
-      (let [players (rcon/parse-listplayers (<!! (rcon/execute connected-client "ListPlayers")))]
-        {:connected true :players players})
-      (finally
-        (safe-disconnect connected-client)))))
-
-(defn- check-rcon-status [rcon-client timeout-ms]
-  (try
-    (fetch-players-via-rcon rcon-client timeout-ms)
-    (catch Exception e
-      (log :warn (str "RCON connection failed: " (type e) " - " (.toString e)
-                      " (host=" (:host rcon-client) ", port=" (:port rcon-client) ")"))
-      {:connected false :error (.toString e)})))
-
-(defn- check-status [k8s-client rcon-client config]
-  (let [k8s-result (try
-                     (<!! (k8s/get-deployment-status k8s-client))
-                     (catch Exception e
-                       {:error (.getMessage e)}))
-        rcon-result (when (:available? k8s-result)
-                      (check-rcon-status rcon-client (:rcon-timeout config)))]
-    (status/determine-status k8s-result rcon-result)))
-
 (defn- handle-help-command [discord-client channel-id]
   (discord/send-message discord-client (commands/format-help) channel-id))
 
 (defn- handle-status-command [discord-client k8s-client rcon-client config channel-id]
-  (let [result (check-status k8s-client rcon-client config)]
+  (let [result (server-status/check-status k8s-client rcon-client config)]
     (discord/send-status-message discord-client (:status result)
                                  (status/format-status-message result) channel-id)))
 
 (defn- handle-players-command [discord-client rcon-client config channel-id]
-  (let [rcon-result (check-rcon-status rcon-client (:rcon-timeout config))
+  (let [rcon-result (server-status/check-rcon-status rcon-client (:rcon-timeout config))
         msg (if (:connected rcon-result)
               (commands/format-players (:players rcon-result []))
               (commands/format-players-error))]
@@ -64,27 +34,28 @@
     :restart (discord/send-restart-confirmation discord-client channel-id)
     nil))
 
-(defn- execute-restart-confirm [token interaction-id interaction-token k8s-client]
+(defn- execute-restart-confirm [token interaction-id interaction-token clients]
   (<!! (discord/respond-to-interaction
         token interaction-id interaction-token
         (discord/build-interaction-update "Restarting ARK server...")))
-  (let [result (<!! (k8s/restart-deployment k8s-client))]
+  (let [result (<!! (k8s/restart-deployment (:k8s-client clients)))]
     (if (:error result)
       (log :error (str "Failed to restart: " (.getMessage (:error result))))
-      (log :info "Server restart initiated successfully"))))
+      (do (log :info "Server restart initiated successfully")
+          (monitor-loop/request-fast-polling! (:monitor-loop clients))))))
 
 (defn- execute-restart-cancel [token interaction-id interaction-token]
   (<!! (discord/respond-to-interaction
         token interaction-id interaction-token
         (discord/build-interaction-update "ARK server restart cancelled."))))
 
-(defn- handle-interaction [interaction-data token k8s-client]
+(defn- handle-interaction [interaction-data token clients]
   (when-let [{:keys [action interaction-id interaction-token]}
              (gateway/parse-interaction interaction-data)]
     (log :info (str "Interaction: " action))
     (case action
       :restart-confirm (execute-restart-confirm token interaction-id
-                                                interaction-token k8s-client)
+                                                interaction-token clients)
       :restart-cancel (execute-restart-cancel token interaction-id interaction-token)
       nil)))
 
@@ -114,9 +85,9 @@
       (try-execute-command content discord-client k8s-client
                            rcon-client config channel_id))))
 
-(defn- handle-interaction-event [interaction-data token k8s-client]
+(defn- handle-interaction-event [interaction-data token clients]
   (try
-    (handle-interaction interaction-data token k8s-client)
+    (handle-interaction interaction-data token clients)
     (catch Exception e
       (log :error (str "Interaction error: " (.getMessage e))))))
 
@@ -130,8 +101,7 @@
   (case (:type event)
     :message (handle-message-event (:data event) (:discord-client clients)
                                    (:k8s-client clients) (:rcon-client clients) config)
-    :interaction (handle-interaction-event (:data event) (:discord-token config)
-                                           (:k8s-client clients))
+    :interaction (handle-interaction-event (:data event) (:discord-token config) clients)
     :ready (handle-ready-event (:data event))
     nil))
 
@@ -147,24 +117,29 @@
       (log :error (str "Event processing error: " (.getMessage e))))))
 
 (defn start-gateway-event-loop
-  "Start event loop to process gateway events. Returns control channel."
+  "Start event loop to process gateway events on a dedicated thread.
+   Command handlers block on HTTP, K8s and RCON calls, so they must not
+   run on the go dispatch pool that drives the gateway heartbeat.
+   Returns control channel."
   [app-events-chan clients config shutdown-atom]
   (let [control-chan (async/chan 1)]
-    (go-loop []
-      (let [[event ch] (alt! app-events-chan ([e] [:event e])
-                             control-chan ([v] [:control v]))]
-        (when (should-continue-event-loop? event ch shutdown-atom)
-          (process-gateway-event event ch clients config)
-          (recur))))
+    (async/thread
+      (loop []
+        (let [[event ch] (alt!! app-events-chan ([e] [:event e])
+                                control-chan ([v] [:control v]))]
+          (when (should-continue-event-loop? event ch shutdown-atom)
+            (process-gateway-event event ch clients config)
+            (recur)))))
     control-chan))
 
 (defmethod ig/init-key :ark/gateway-event-loop [_ {:keys [gateway discord-client k8s-client
-                                                          rcon-client config]}]
+                                                          rcon-client monitor-loop config]}]
            (log :info "Starting gateway event loop...")
            (let [shutdown-atom (atom false)
                  clients {:discord-client discord-client
                           :k8s-client k8s-client
-                          :rcon-client rcon-client}
+                          :rcon-client rcon-client
+                          :monitor-loop monitor-loop}
                  control-chan (start-gateway-event-loop (:app-events-chan gateway)
                                                         clients config shutdown-atom)]
              {:control-chan control-chan
@@ -9,5 +9,6 @@
                               (:k8s-service config)))
 
 (defmethod ig/halt-key! :ark/k8s-client [_ client]
-           (when-let [http-client (:http-client client)]
-             (.close http-client)))
+           (when-let [http-client-delay (:http-client client)]
+             (when (realized? http-client-delay)
+               (some-> @http-client-delay .close))))
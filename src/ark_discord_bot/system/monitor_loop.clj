@@ -4,60 +4,72 @@
               [ark-discord-bot.core.status :as status]
               [ark-discord-bot.effects.discord :as discord]
               [ark-discord-bot.effects.kubernetes :as k8s]
-              [ark-discord-bot.effects.rcon :as rcon]
-              [clojure.core.async :as async :refer [go-loop alt! timeout <!!]]
+              [ark-discord-bot.effects.server-status :as server-status]
+              [ark-discord-bot.log :refer [log]]
+              [clojure.core.async :as async :refer [<!! alt!! timeout]]
               [integrant.core :as ig]))
 
-(defn- log [level msg]
-  (println (str "[" (name level) "] " msg)))
+(defn- calculate-projected-count [monitor-state new-status]
+  (monitor/projected-failure-count monitor-state new-status))
 
-(defn- safe-disconnect [client]
-  (when client
-    (try (<!! (rcon/disconnect client)) (catch Exception _))))
+(def ^:private outbox-size
+     "Pending notifications kept while Discord is slow; when full, the
+   oldest is evicted (see enqueue-notification!)."
+     32)
 
-(defn- fetch-players-via-rcon [rcon-client timeout-ms]
-  (let [connected-client (<!! (rcon/connect rcon-client timeout-ms))]
-    (try
-      (let [players (rcon/parse-listplayers (<!! (rcon/execute connected-client "ListPlayers")))]
-        {:connected true :players players})
-      (finally
-        (safe-disconnect connected-client)))))
+(defn- enqueue-notification!
+  "Offer a notification to the outbox. When it is full, evict and log the
+   oldest pending one so the newest status always gets through."
+  [outbox notification]
+  (when-not (async/offer! outbox notification)
+    (when-let [[dropped-status] (async/poll! outbox)]
+      (log :warn (str "Notification outbox full, dropped: " dropped-status)))
+    (async/offer! outbox notification)))
+
+(defn- notify-status-change
+  "Queue a status notification; the notifier posts it off the monitor thread."
+  [outbox new-status result]
+  (log :info (str "Status changed to: " new-status))
+  (enqueue-notification! outbox [new-status (status/format-status-message result)]))
 
-(defn- check-rcon-status [rcon-client timeout-ms]
+(defn- post-notification!
+  "Send one queued notification, logging instead of throwing on failure
+   so the notifier keeps draining the outbox."
+  [discord-client [new-status details]]
   (try
-    (fetch-players-via-rcon rcon-client timeout-ms)
+    (when (nil? (<!! (discord/send-status-message discord-client new-status details)))
+      (log :error (str "Failed to send status notification: " new-status)))
     (catch Exception e
-      (log :warn (str "RCON connection failed: " (type e) " - " (.toString e)
-                      " (host=" (:host rcon-client) ", port=" (:port rcon-client) ")"))
-      {:connected false :error (.toString e)})))
-
-(defn- check-status [k8s-client rcon-client config]
-  (let [k8s-result (try
-                     (<!! (k8s/get-deployment-status k8s-client))
-                     (catch Exception e
-                       {:error (.getMessage e)}))
-        rcon-result (when (:available? k8s-result)
-                      (check-rcon-status rcon-client (:rcon-timeout config)))]
-    (status/determine-status k8s-result rcon-result)))
+      (log :error (str "Failed to send status notification: " (.getMessage e))))))
 
-(defn- calculate-projected-count [monitor-state new-status]
-  (monitor/projected-failure-count monitor-state new-status))
-
-(defn- notify-status-change [discord-client new-status result]
-  (log :info (str "Status changed to: " new-status))
-  (discord/send-status-message discord-client new-status
-                               (status/format-status-message result)))
+(defn- start-notifier
+  "Post queued notifications to Discord one at a time, in order, until the
+   outbox is closed. Waiting on each send keeps messages ordered without
+   holding up status checks."
+  [discord-client outbox]
+  (async/thread
+    (loop []
+      (when-let [notification (<!! outbox)]
+        (post-notification! discord-client notification)
+        (recur)))))
 
 (defn- update-monitor-state! [monitor-state-atom new-status]
   (swap! monitor-state-atom monitor/update-state new-status))
 
-(defn- execute-monitor-cycle [discord-client k8s-client rcon-client config monitor-state-atom]
-  (let [result (check-status k8s-client rcon-client config)
+(defn- cycle-opts
+  "Monitor checks bypass caches. While the server is known to be running,
+   RCON is probed alongside K8s instead of after it."
+  [monitor-state]
+  {:force? true :eager-rcon? (= :running (:last-status monitor-state))})
+
+(defn- execute-monitor-cycle [outbox k8s-client rcon-client config monitor-state-atom]
+  (let [result (server-status/check-status k8s-client rcon-client config
+                                           (cycle-opts @monitor-state-atom))
         new-status (:status result)
         monitor-state @monitor-state-atom
         projected-count (calculate-projected-count monitor-state new-status)]
     (when (monitor/should-notify-with-debounce? monitor-state new-status projected-count)
-      (notify-status-change discord-client new-status result))
+      (notify-status-change outbox new-status result))
     (update-monitor-state! monitor-state-atom new-status)))
 
 (defn- handle-monitor-error [e]
@@ -68,31 +80,68 @@
   (and (not= :control (first alt-result))
        (not @shutdown-atom)))
 
+(defn- run-monitor-cycle-safely
+  [outbox k8s-client rcon-client config monitor-state-atom]
+  (try
+    (execute-monitor-cycle outbox k8s-client rcon-client config monitor-state-atom)
+    (catch Exception e (handle-monitor-error e))))
+
+(defn- poll-interval [config monitor-state-atom]
+  (monitor/next-interval @monitor-state-atom (:monitor-interval config)))
+
+(defn- wait-for-next-cycle [config monitor-state-atom {:keys [control-chan wake-chan]}]
+  (alt!! (timeout (poll-interval config monitor-state-atom)) [:timeout]
+         wake-chan [:wake]
+         control-chan ([v] [:control v])))
+
 (defn start-monitor-loop
-  "Start background monitoring loop using core.async.
-   Returns the control channel for stopping the loop."
-  [discord-client k8s-client rcon-client config monitor-state-atom shutdown-atom]
-  (let [control-chan (async/chan 1)]
-    (go-loop []
-      (let [result (alt! (timeout (:monitor-interval config)) [:timeout]
-                         control-chan ([v] [:control v]))]
+  "Start background monitoring loop on a dedicated thread, posting
+   notifications to outbox. A message on :wake-chan restarts the wait."
+  [outbox k8s-client rcon-client config monitor-state-atom shutdown-atom chans]
+  (async/thread
+    (loop []
+      (let [result (wait-for-next-cycle config monitor-state-atom chans)]
         (when (should-continue-monitor? result shutdown-atom)
-          (try
-            (execute-monitor-cycle discord-client k8s-client rcon-client config monitor-state-atom)
-            (catch Exception e (handle-monitor-error e)))
-          (recur))))
-    control-chan))
+          (when (= :timeout (first result))
+            (run-monitor-cycle-safely outbox k8s-client rcon-client
+                                      config monitor-state-atom))
+          (recur))))))
+
+(defn request-fast-polling!
+  "Reset the monitor's backoff and cut the current wait short, so the
+   next checks run at the base interval. Used after a restart request."
+  [{:keys [monitor-state wake-chan]}]
+  (swap! monitor-state monitor/reset-backoff)
+  (async/offer! wake-chan :wake))
+
+(def ^:private halt-timeout-ms
+     "Longest halt waits for an in-flight cycle (K8s plus RCON timeouts)."
+     20000)
+
+(defn- join-loop!
+  "Wait for the loop thread to finish its current cycle, up to halt-timeout-ms."
+  [loop-chan]
+  (let [[_ port] (async/alts!! [loop-chan (timeout halt-timeout-ms)])]
+    (when-not (= port loop-chan)
+      (log :warn "Monitor loop did not stop within the halt timeout"))))
 
 (defmethod ig/init-key :ark/monitor-loop [_ {:keys [discord-client k8s-client rcon-client
                                                     monitor-state config]}]
            (log :info "Starting monitor loop...")
            (let [shutdown-atom (atom false)
-                 control-chan (start-monitor-loop discord-client k8s-client rcon-client
-                                                  config monitor-state shutdown-atom)]
-             {:control-chan control-chan
-              :shutdown-atom shutdown-atom}))
+                 outbox (async/chan outbox-size)
+                 chans {:control-chan (async/chan 1)
+                        :wake-chan (async/chan (async/sliding-buffer 1))}]
+             (start-notifier discord-client outbox)
+             (assoc chans :outbox outbox :shutdown-atom shutdown-atom
+                    :monitor-state monitor-state
+                    :loop-chan (start-monitor-loop outbox k8s-client rcon-client
+                                                   config monitor-state shutdown-atom chans))))
 
-(defmethod ig/halt-key! :ark/monitor-loop [_ {:keys [control-chan shutdown-atom]}]
+(defmethod ig/halt-key! :ark/monitor-loop [_ {:keys [control-chan outbox shutdown-atom
+                                                     loop-chan]}]
            (reset! shutdown-atom true)
            (async/put! control-chan :stop)
-           (async/close! control-chan))
+           (async/close! control-chan)
+           (join-loop! loop-chan)
+           (async/close! outbox))
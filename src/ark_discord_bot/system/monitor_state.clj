@@ -5,4 +5,5 @@
 (defmethod ig/init-key :ark/monitor-state [_ {:keys [config]}]
            (atom {:last-status nil
                   :failure-count 0
+                  :stable-count 0
                   :failure-threshold (:failure-threshold config)}))
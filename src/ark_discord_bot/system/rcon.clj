@@ -7,3 +7,6 @@
            (rcon/create-client (:rcon-host config)
                                (:rcon-port config)
                                (:rcon-password config)))
+
+(defmethod ig/halt-key! :ark/rcon-client [_ client]
+           (rcon/close! client))
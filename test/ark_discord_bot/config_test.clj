@@ -51,5 +51,19 @@
     (let [config {:rcon-port 27020 :monitor-interval 60000}]
       (is (= config (config/validate-config config))))))
 
-;; Run tests when loaded
-(clojure.test/run-tests 'ark-discord-bot.config-test)
+(deftest test-load-config-from-map
+  (testing "load-config reads from the given environment map"
+    (let [env {"DISCORD_BOT_TOKEN" "token" "DISCORD_CHANNEL_ID" "123"
+               "RCON_PASSWORD" "secret" "RCON_PORT" "27015"
+               "MONITORING_INTERVAL" "60"}
+          config (config/load-config env)]
+      (is (= "token" (:discord-token config)))
+      (is (= 27015 (:rcon-port config)))
+      (is (= 60000 (:monitor-interval config)))
+      (is (= "ark-server" (:k8s-deployment config))))))
+
+(deftest test-load-config-missing-required
+  (testing "load-config throws when a required key is missing"
+    (is (thrown-with-msg? clojure.lang.ExceptionInfo
+                          #"DISCORD_BOT_TOKEN"
+                          (config/load-config {})))))
@@ -1,7 +1,13 @@
 (ns ark-discord-bot.core.monitor-test
     "Tests for server monitor with debounce logic."
     (:require [ark-discord-bot.core.monitor :as monitor]
-              [clojure.test :refer [deftest is testing]]))
+              [clojure.string :as str]
+              [clojure.test :refer [are deftest is testing]]))
+
+;; Immutable states shared by the tests below, built once per run.
+(def ^:private initial-state (monitor/create-state 3))
+
+(def ^:private running-state (monitor/update-state initial-state :running))
 
 (deftest test-create-state
   (testing "create-state initializes correctly"
@@ -10,33 +16,23 @@
       (is (= 0 (:failure-count state)))
       (is (= 3 (:failure-threshold state))))))
 
-(deftest test-should-notify-first-check
-  (testing "should-notify? returns true for first check"
-    (let [state (monitor/create-state 3)]
-      (is (monitor/should-notify? state :running)))))
-
-(deftest test-should-notify-status-change
-  (testing "should-notify? returns true on status change"
-    (let [state (-> (monitor/create-state 3)
-                    (monitor/update-state :running))]
-      (is (monitor/should-notify? state :error)))))
-
-(deftest test-should-notify-same-status
-  (testing "should-notify? returns false for same status"
-    (let [state (-> (monitor/create-state 3)
-                    (monitor/update-state :running))]
-      (is (not (monitor/should-notify? state :running))))))
+(deftest test-should-notify
+  (testing "should-notify? fires on the first check and on status changes only"
+    (are [state new-status expected]
+         (= expected (boolean (monitor/should-notify? state new-status)))
+      initial-state :running true
+      running-state :error true
+      running-state :running false)))
 
 (deftest test-debounce-initial-check-suppressed
   (testing "should-notify-with-debounce? returns false when last-status is nil"
-    (let [state (monitor/create-state 3)]
+    (let [state initial-state]
       ;; First check with :running should not notify
       (is (not (monitor/should-notify-with-debounce? state :running 0)))
       ;; First check with :error should not notify
       (is (not (monitor/should-notify-with-debounce? state :error 1)))))
   (testing "after update-state, normal notification logic resumes"
-    (let [state (-> (monitor/create-state 3)
-                    (monitor/update-state :running))]
+    (let [state running-state]
       ;; Now transitioning from :running to :error should work normally
       (is (not (monitor/should-notify-with-debounce? state :error 1)))
       (is (monitor/should-notify-with-debounce? state :error 3))))
@@ -57,8 +53,7 @@
 
 (deftest test-debounce-failures
   (testing "debounce delays notification until threshold"
-    (let [state (-> (monitor/create-state 3)
-                    (monitor/update-state :running))]
+    (let [state running-state]
       ;; First failure - no notification yet
       (is (not (monitor/should-notify-with-debounce? state :error 1)))
       ;; Second failure - still no notification
@@ -68,8 +63,7 @@
 
 (deftest test-update-state
   (testing "update-state updates correctly"
-    (let [state (-> (monitor/create-state 3)
-                    (monitor/update-state :running))]
+    (let [state running-state]
       (is (= :running (:last-status state)))
       (is (= 0 (:failure-count state))))))
 
@@ -82,17 +76,57 @@
 
 (deftest test-projected-failure-count
   (testing "returns 0 for running status"
-    (let [state (-> (monitor/create-state 3)
-                    (monitor/update-state :running))]
+    (let [state running-state]
       (is (= 0 (monitor/projected-failure-count state :running)))))
   (testing "increments failure-count for non-running status"
-    (let [state (-> (monitor/create-state 3)
-                    (monitor/update-state :running))]
+    (let [state running-state]
       (is (= 1 (monitor/projected-failure-count state :error)))))
   (testing "does not increment on initial check (last-status nil)"
-    (let [state (monitor/create-state 3)]
+    (let [state initial-state]
       (is (= 0 (monitor/projected-failure-count state :error)))
       (is (= 0 (monitor/projected-failure-count state :running))))))
 
-;; Run tests when loaded
-(clojure.test/run-tests 'ark-discord-bot.core.monitor-test)
+(deftest test-next-interval
+  (let [running (fn [n] (nth (iterate #(monitor/update-state % :running)
+                                      initial-state)
+                             n))]
+    (testing "uses the base interval until the server has been stable"
+      (is (= 30000 (monitor/next-interval initial-state 30000)))
+      (is (= 30000 (monitor/next-interval (running 1) 30000))))
+    (testing "doubles per consecutive running check, capped at 5 minutes"
+      (is (= 60000 (monitor/next-interval (running 2) 30000)))
+      (is (= 120000 (monitor/next-interval (running 3) 30000)))
+      (is (= 300000 (monitor/next-interval (running 10) 30000))))
+    (testing "resets to the base interval on any other status"
+      (is (= 30000 (monitor/next-interval
+                    (monitor/update-state (running 5) :starting) 30000))))
+    (testing "reset-backoff returns to the base interval"
+      (is (= 30000 (monitor/next-interval (monitor/reset-backoff (running 5)) 30000))))
+    (testing "never goes below a base interval above the cap"
+      (is (= 600000 (monitor/next-interval (running 5) 600000))))))
+
+(deftest test-format-notification
+  (testing "every [current previous] pair yields its expected message or nil"
+    (are [cur prev needle]
+         (let [msg (monitor/format-notification cur prev)]
+           (if needle (str/includes? (str msg) needle) (nil? msg)))
+      :running nil "接続準備完了"
+      :running :running nil
+      :running :starting "接続準備完了"
+      :running :not-ready "接続準備完了"
+      :running :error "接続準備完了"
+      :starting nil nil
+      :starting :running "再起動中または準備未完了"
+      :starting :starting nil
+      :starting :not-ready "ゲームサーバー起動中"
+      :starting :error nil
+      :not-ready nil nil
+      :not-ready :running "再起動中または準備未完了"
+      :not-ready :starting nil
+      :not-ready :not-ready nil
+      :not-ready :error nil
+      :error nil "エラーが発生"
+      :error :running "エラーが発生"
+      :error :starting "エラーが発生"
+      :error :not-ready "エラーが発生"
+      :error :error "エラーが発生")))
@@ -48,6 +48,3 @@
                 :rcon {:connected true :players [{:name "Player1"}]}})]
       (is (string? msg))
       (is (pos? (count msg))))))
-
-;; Run tests when loaded
-(clojure.test/run-tests 'ark-discord-bot.core.status-test)
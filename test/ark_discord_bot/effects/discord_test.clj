@@ -2,13 +2,20 @@
     "Tests for Discord HTTP client."
     (:require [ark-discord-bot.effects.discord :as discord]
               [clojure.string :as str]
-              [clojure.test :refer [deftest is testing]]))
+              [clojure.test :refer [are deftest is testing]]))
 
 (deftest test-create-client
   (testing "create-client returns client map"
     (let [c (discord/create-client "test-token" "123456789")]
       (is (= "test-token" (:token c)))
-      (is (= "123456789" (:channel-id c))))))
+      (is (= "123456789" (:channel-id c)))
+      (is (= "/channels/123456789/messages" (:messages-path c))))))
+
+(deftest test-messages-path
+  (testing "messages-path uses the cached path for the default channel"
+    (let [c (discord/create-client "test-token" "123")]
+      (is (identical? (:messages-path c) (#'discord/messages-path c "123")))
+      (is (= "/channels/456/messages" (#'discord/messages-path c "456"))))))
 
 (deftest test-build-embed
   (testing "build-embed creates correct structure"
@@ -24,15 +31,16 @@
     (is (= 0xFFFF00 (:color (discord/build-embed "T" "D" :warning))))
     (is (= 0x3498DB (:color (discord/build-embed "T" "D" :info))))))
 
-(deftest test-format-status-running
-  (testing "format-status shows running correctly"
-    (let [result (discord/format-status :running)]
-      (is (str/includes? result "稼働中")))))
-
-(deftest test-format-status-starting
-  (testing "format-status shows starting correctly"
-    (let [result (discord/format-status :starting)]
-      (is (str/includes? result "起動中")))))
+(deftest test-format-status
+  (testing "format-status describes each known status"
+    (are [status fragment] (str/includes? (discord/format-status status) fragment)
+      :running "稼働中"
+      :starting "起動中"
+      :not-ready "準備未完了"
+      :error "エラー"))
+  (testing "format-status falls back for unknown statuses"
+    (is (= "❓ 不明なサーバーステータス: weird"
+           (discord/format-status :weird)))))
 
 (deftest test-build-restart-confirmation
   (testing "build-restart-confirmation creates embed with buttons"
@@ -73,6 +81,3 @@
             buttons (:components action-row)]
         (is (= 1 (count components)))  ;; One action row
         (is (every? :disabled buttons))))))
-
-;; Run tests when loaded
-(clojure.test/run-tests 'ark-discord-bot.effects.discord-test)
@@ -69,6 +69,12 @@
   (testing "calculate-backoff caps at max delay"
     (is (= 60000 (gateway/calculate-backoff 10)))))
 
+(deftest test-jittered-backoff
+  (testing "jittered-backoff adds up to 10% of the backoff"
+    (is (= 2000 (gateway/jittered-backoff 1 0)))
+    (is (= 2100 (gateway/jittered-backoff 1 0.5)))
+    (is (<= 60000 (gateway/jittered-backoff 10) 66000))))
+
 (deftest test-build-heartbeat
   (testing "build-heartbeat creates correct payload"
     (let [payload (#'gateway/build-heartbeat 42)]
@@ -90,7 +96,7 @@
       (async/close! (:heartbeat channels))
       (async/close! (:app-events channels)))))
 
-(deftest test-heartbeat-loop-stops-on-control
+(deftest ^:slow test-heartbeat-loop-stops-on-control
   (testing "heartbeat loop stops when stop command received on control channel"
     (let [heartbeat-chan (async/chan)
           control-chan (async/chan)
@@ -115,171 +121,106 @@
       (async/close! heartbeat-chan)
       (async/close! control-chan))))
 
+(defn- create-loop-channels
+  "Channels for driving start-event-loop-with-state in a test."
+  []
+  {:ws-events (async/chan)
+   :control (async/chan)
+   :heartbeat (async/chan)
+   :app-events (async/chan 10)})
+
+(defn- start-test-event-loop
+  "Start the gateway event loop on test channels with a dummy ws client."
+  [channels state-atom]
+  (#'gateway/start-event-loop-with-state (reify Object) "test-token"
+                                         (:ws-events channels) (:control channels)
+                                         (:heartbeat channels) (:app-events channels)
+                                         state-atom))
+
+(defn- close-loop-channels!
+  "Close every channel created by create-loop-channels."
+  [channels]
+  (run! async/close! (vals channels)))
+
 (deftest test-event-loop-processes-hello
   (testing "HELLO opcode triggers IDENTIFY and starts heartbeat"
-    (let [ws-events-chan (async/chan)
-          control-chan (async/chan)
-          heartbeat-control-chan (async/chan)
-          app-events-chan (async/chan 10)
-          identify-sent (atom false)
-          heartbeat-started (atom false)
-          mock-ws-client (reify Object)
-          state-atom (create-test-state)]
+    (let [channels (create-loop-channels)
+          identify-sent (promise)
+          heartbeat-started (promise)]
       (with-redefs [gateway/send-json (fn [_ payload]
                                         (when (= 2 (:op payload))
-                                          (reset! identify-sent true)))
+                                          (deliver identify-sent true)))
                     gateway/start-heartbeat-loop-with-state
-                    (fn [_ _ _ _ _] (reset! heartbeat-started true))]
-        ;; Start event loop
-                   (#'gateway/start-event-loop-with-state mock-ws-client "test-token"
-                                                          ws-events-chan control-chan
-                                                          heartbeat-control-chan
-                                                          app-events-chan state-atom)
-        ;; Send HELLO message
-                   (async/>!! ws-events-chan {:type :message
-                                              :data {:op 10 :d {:heartbeat_interval 5000}}})
-        ;; Wait for processing
-                   (Thread/sleep 50)
-        ;; Verify
-                   (is @identify-sent "IDENTIFY should be sent on HELLO")
-                   (is @heartbeat-started "Heartbeat loop should start on HELLO"))
-      ;; Cleanup
-      (async/>!! control-chan :shutdown)
-      (async/close! ws-events-chan)
-      (async/close! control-chan)
-      (async/close! heartbeat-control-chan)
-      (async/close! app-events-chan))))
+                    (fn [_ _ _ _ _] (deliver heartbeat-started true))]
+                   (start-test-event-loop channels (create-test-state))
+                   (async/>!! (:ws-events channels)
+                              {:type :message :data {:op 10 :d {:heartbeat_interval 5000}}})
+                   (is (deref identify-sent 1000 false) "IDENTIFY should be sent on HELLO")
+                   (is (deref heartbeat-started 1000 false)
+                       "Heartbeat loop should start on HELLO"))
+      (async/>!! (:control channels) :shutdown)
+      (close-loop-channels! channels))))
 
 (deftest test-event-loop-processes-dispatch
   (testing "DISPATCH opcode sends event to app-events channel"
-    (let [ws-events-chan (async/chan)
-          control-chan (async/chan)
-          heartbeat-control-chan (async/chan)
-          app-events-chan (async/chan 10)
-          mock-ws-client (reify Object)
-          state-atom (create-test-state)]
-      ;; Start event loop
-      (#'gateway/start-event-loop-with-state mock-ws-client "test-token"
-                                             ws-events-chan control-chan
-                                             heartbeat-control-chan
-                                             app-events-chan state-atom)
+    (let [channels (create-loop-channels)]
+      (start-test-event-loop channels (create-test-state))
       ;; Send DISPATCH message
-      (async/>!! ws-events-chan {:type :message
-                                 :data {:op 0 :t "MESSAGE_CREATE" :s 1
-                                        :d {:content "test"}}})
-      ;; Wait for processing
-      (Thread/sleep 50)
+      (async/>!! (:ws-events channels) {:type :message
+                                        :data {:op 0 :t "MESSAGE_CREATE" :s 1
+                                               :d {:content "test"}}})
       ;; Verify event was sent to app-events channel
-      (let [event (async/poll! app-events-chan)]
+      (let [event (async/alt!! (:app-events channels) ([e] e)
+                               (async/timeout 1000) nil)]
         (is (= :message (:type event))
             "Event type should be :message")
         (is (= {:content "test"} (:data event))
             "Event data should contain message content"))
-      ;; Cleanup
-      (async/>!! control-chan :shutdown)
-      (async/close! ws-events-chan)
-      (async/close! control-chan)
-      (async/close! heartbeat-control-chan)
-      (async/close! app-events-chan))))
+      (async/>!! (:control channels) :shutdown)
+      (close-loop-channels! channels))))
+
+(defn- run-close-event
+  "Feed the event loop a close event with reconnect scheduling stubbed.
+   Waits for the loop to exit and returns a promise delivered on reconnect."
+  [state-atom]
+  (let [channels (create-loop-channels)
+        reconnect (promise)]
+    (gateway/set-gateway-channels-with-state! state-atom channels)
+    (with-redefs [gateway/schedule-reconnect-with-state
+                  (fn [_token _channels _attempt _state-atom] (deliver reconnect true))]
+                 (let [loop-chan (start-test-event-loop channels state-atom)]
+                   (async/>!! (:ws-events channels) {:type :close :code 1006 :reason ""})
+                   (async/alts!! [loop-chan (async/timeout 1000)])))
+    (close-loop-channels! channels)
+    reconnect))
 
 (deftest test-event-loop-handles-close-triggers-reconnect
   (testing "close event triggers reconnection (running? stays true)"
-    (let [ws-events-chan (async/chan)
-          control-chan (async/chan)
-          heartbeat-control-chan (async/chan)
-          app-events-chan (async/chan 10)
-          reconnect-called (atom false)
-          mock-ws-client (reify Object)
-          state-atom (create-test-state)
-          channels {:ws-events ws-events-chan
-                    :control control-chan
-                    :heartbeat heartbeat-control-chan
-                    :app-events app-events-chan}]
-      (gateway/set-gateway-channels-with-state! state-atom channels)
-      (with-redefs [gateway/schedule-reconnect-with-state
-                    (fn [& _] (reset! reconnect-called true))]
-        ;; Start event loop
-                   (#'gateway/start-event-loop-with-state mock-ws-client "test-token"
-                                                          ws-events-chan control-chan
-                                                          heartbeat-control-chan
-                                                          app-events-chan state-atom)
-        ;; Send close event
-                   (async/>!! ws-events-chan {:type :close :code 1006 :reason ""})
-        ;; Wait for processing
-                   (Thread/sleep 50)
-        ;; Verify reconnect was scheduled (not shutdown)
-                   (is @reconnect-called
-                       "Reconnect should be scheduled on normal close"))
-      ;; Cleanup
-      (async/close! ws-events-chan)
-      (async/close! control-chan)
-      (async/close! heartbeat-control-chan)
-      (async/close! app-events-chan))))
+    (is (deref (run-close-event (create-test-state)) 1000 false)
+        "Reconnect should be scheduled on normal close")))
 
 (deftest test-event-loop-handles-close-during-shutdown
   (testing "close event does NOT trigger reconnect when shutdown-requested"
-    (let [ws-events-chan (async/chan)
-          control-chan (async/chan)
-          heartbeat-control-chan (async/chan)
-          app-events-chan (async/chan 10)
-          reconnect-called (atom false)
-          mock-ws-client (reify Object)
-          state-atom (create-test-state)
-          channels {:ws-events ws-events-chan
-                    :control control-chan
-                    :heartbeat heartbeat-control-chan
-                    :app-events app-events-chan}]
-      (gateway/set-gateway-channels-with-state! state-atom channels)
-      ;; Set shutdown-requested? to true (simulating explicit shutdown)
+    (let [state-atom (create-test-state)]
+      ;; Simulate an explicit shutdown
       (gateway/set-shutdown-requested-with-state! state-atom true)
-      (with-redefs [gateway/schedule-reconnect-with-state
-                    (fn [& _] (reset! reconnect-called true))]
-        ;; Start event loop
-                   (#'gateway/start-event-loop-with-state mock-ws-client "test-token"
-                                                          ws-events-chan control-chan
-                                                          heartbeat-control-chan
-                                                          app-events-chan state-atom)
-        ;; Send close event
-                   (async/>!! ws-events-chan {:type :close :code 1006 :reason ""})
-        ;; Wait for processing
-                   (Thread/sleep 50)
-        ;; Verify reconnect was NOT scheduled during shutdown
-                   (is (false? @reconnect-called)
-                       "Reconnect should NOT be scheduled during shutdown"))
-      ;; Cleanup
-      (async/close! ws-events-chan)
-      (async/close! control-chan)
-      (async/close! heartbeat-control-chan)
-      (async/close! app-events-chan))))
+      (is (not (realized? (run-close-event state-atom)))
+          "Reconnect should NOT be scheduled during shutdown"))))
 
 (deftest test-event-loop-handles-reconnect-opcode
   (testing "RECONNECT opcode (op=7) closes connection"
-    (let [ws-events-chan (async/chan)
-          control-chan (async/chan)
-          heartbeat-control-chan (async/chan)
-          app-events-chan (async/chan 10)
-          close-called (atom false)
-          mock-ws-client (reify Object)
-          state-atom (create-test-state)]
-      (with-redefs [gateway/close-ws! (fn [_] (reset! close-called true))]
-                   (#'gateway/start-event-loop-with-state mock-ws-client "test-token"
-                                                          ws-events-chan control-chan
-                                                          heartbeat-control-chan
-                                                          app-events-chan state-atom)
+    (let [channels (create-loop-channels)
+          close-called (promise)]
+      (with-redefs [gateway/close-ws! (fn [_] (deliver close-called true))]
+                   (start-test-event-loop channels (create-test-state))
         ;; Send RECONNECT opcode
-                   (async/>!! ws-events-chan {:type :message :data {:op 7}})
-        ;; Wait for processing
-                   (Thread/sleep 50)
-        ;; Verify close was called
-                   (is @close-called "WebSocket should be closed on RECONNECT opcode"))
-      ;; Cleanup
-      (async/>!! control-chan :shutdown)
-      (async/close! ws-events-chan)
-      (async/close! control-chan)
-      (async/close! heartbeat-control-chan)
-      (async/close! app-events-chan))))
+                   (async/>!! (:ws-events channels) {:type :message :data {:op 7}})
+                   (is (deref close-called 1000 false)
+                       "WebSocket should be closed on RECONNECT opcode"))
+      (async/>!! (:control channels) :shutdown)
+      (close-loop-channels! channels))))
 
-(deftest test-shutdown-stops-all-loops
+(deftest ^:slow test-shutdown-stops-all-loops
   (testing "shutdown-with-state! closes channels and stops loops"
     (let [channels (gateway/create-gateway-channels)
           state-atom (create-test-state)]
@@ -300,13 +241,15 @@
           state-atom (create-test-state)]
       (gateway/set-gateway-channels-with-state! state-atom channels)
       (with-redefs [gateway/wait-ms (fn [ms] (swap! wait-times conj ms))
-                    gateway/establish-websocket (fn [& _]
+                    gateway/establish-websocket (fn [_token _channels]
                                                   (swap! connect-attempts inc)
                                                   (when (< @connect-attempts 3)
                                                     (throw (Exception. "Test failure")))
                                                   ;; Success on 3rd attempt
                                                   :mock-ws)
-                    gateway/start-event-loop-with-state (fn [& _] nil)]
+                    gateway/start-event-loop-with-state
+                    (fn [_ws-client _token _ws-events _control _heartbeat _app-events _state-atom]
+                      nil)]
         ;; Trigger reconnect (use blocking reconnect for predictable timing)
                    (#'gateway/reconnect-with-backoff-with-state "token" channels 0 state-atom)
         ;; Verify backoff delays (first 2 attempts fail, 3rd succeeds)
@@ -317,6 +260,3 @@
       (async/close! (:control channels))
       (async/close! (:heartbeat channels))
       (async/close! (:app-events channels)))))
-
-;; Run tests when loaded
-(clojure.test/run-tests 'ark-discord-bot.effects.gateway-test)
@@ -1,7 +1,10 @@
 (ns ark-discord-bot.effects.kubernetes-test
     "Tests for Kubernetes client."
     (:require [ark-discord-bot.effects.kubernetes :as k8s]
-              [clojure.test :refer [deftest is testing]]))
+              [clojure.core.async :as async]
+              [clojure.test :refer [deftest is testing]])
+    (:import [java.net.http HttpTimeoutException]
+             [java.time Instant]))
 
 (deftest test-create-client
   (testing "create-client returns client map"
@@ -19,7 +22,19 @@
     (let [c (k8s/create-client "default" "ark-server" "ark-service")]
       ;; http-client is nil outside K8s cluster (no CA cert file)
       ;; but the key should exist in the client map
-      (is (contains? c :http-client)))))
+      (is (contains? c :http-client))))
+
+  (testing "create-client defers http-client creation until first use"
+    (let [c (k8s/create-client "default" "ark-server" "ark-service")]
+      (is (not (realized? (:http-client c))))
+      ;; nil outside K8s cluster (no CA cert file)
+      (is (nil? (k8s/http-client c)))
+      (is (realized? (:http-client c))))))
+
+(deftest test-request-opts-timeout
+  (testing "request-opts bounds every API request with a timeout"
+    (let [c (k8s/create-client "default" "ark-server" "ark-service")]
+      (is (= 5000 (:timeout (#'k8s/request-opts c {})))))))
 
 (deftest test-parse-deployment-status-ready
   (testing "parse-deployment-status extracts ready replicas"
@@ -40,6 +55,93 @@
       (is (= 0 (:ready status)))
       (is (false? (:available? status))))))
 
+(deftest test-read-token-cached
+  (testing "read-token reuses the token within the refresh window"
+    (let [token-file (java.io.File/createTempFile "k8s-token" ".txt")
+          c (assoc (k8s/create-client "default" "ark-server" "ark-service")
+                   :token-path (.getPath token-file))]
+      (spit token-file "token-1\n")
+      (is (= "token-1" (#'k8s/read-token c)))
+      (spit token-file "token-2")
+      (is (= "token-1" (#'k8s/read-token c)))
+      (testing "and re-reads the file once the window has passed"
+        (swap! (:token-cache c) assoc :read-at 0)
+        (is (= "token-2" (#'k8s/read-token c))))
+      (.delete token-file))))
+
+(deftest test-cached-status
+  (testing "cached-status returns a fresh cached status"
+    (let [c (k8s/create-client "default" "ark-server" "ark-service")
+          status {:replicas 1 :ready 1 :available? true}]
+      (is (nil? (#'k8s/cached-status c 1000)))
+      (reset! (:status-cache c) {:status status :fetched-at 1000})
+      (is (= status (#'k8s/cached-status c 2000)))
+      (testing "and nil once it is stale"
+        (is (nil? (#'k8s/cached-status c 7000)))))))
+
+(deftest test-fetch-deployment-status-stale-fallback
+  (testing "a transient API failure falls back to a recent cached status"
+    (let [c (k8s/create-client "default" "ark-server" "ark-service")
+          status {:replicas 1 :ready 1 :available? true}]
+      (reset! (:status-cache c) {:status status :fetched-at 1000})
+      (with-redefs [k8s/get-deployment-status-impl
+                    (fn [_] (throw (ex-info "error" {:body "etcdserver: leader changed"})))]
+                   (is (= status (#'k8s/fetch-deployment-status c 21000)))
+                   (testing "but rethrows once the cache is too old"
+                     (is (thrown? clojure.lang.ExceptionInfo
+                                  (#'k8s/fetch-deployment-status c 40000))))))))
+
+(deftest test-fetch-deployment-status-timeout-fallback
+  (testing "a request timeout falls back to a recent cached status"
+    (let [c (k8s/create-client "default" "ark-server" "ark-service")
+          status {:replicas 1 :ready 1 :available? true}]
+      (reset! (:status-cache c) {:status status :fetched-at 1000})
+      (with-redefs [k8s/get-deployment-status-impl
+                    (fn [_] (throw (HttpTimeoutException. "request timed out")))]
+                   (is (= status (#'k8s/fetch-deployment-status c 21000)))))))
+
+(deftest test-fetch-deployment-status-does-not-mask-404
+  (testing "a non-transient API failure is rethrown even with a fresh cache"
+    (let [c (k8s/create-client "default" "ark-server" "ark-service")
+          not-found (ex-info "Failed to get deployment"
+                             {:status 404 :body "deployments \"ark-server\" not found"})]
+      (reset! (:status-cache c) {:status {:ready 1 :available? true} :fetched-at 1000})
+      (with-redefs [k8s/get-deployment-status-impl (fn [_] (throw not-found))]
+                   (is (thrown-with-msg? clojure.lang.ExceptionInfo #"Failed to get deployment"
+                                         (#'k8s/fetch-deployment-status c 2000)))))))
+
+(deftest ^:slow test-get-deployment-status-coalesces
+  (testing "concurrent status requests share one API call"
+    (let [c (k8s/create-client "default" "ark-server" "ark-service")
+          calls (atom 0)]
+      (with-redefs [k8s/get-deployment-status-impl
+                    (fn [_] (swap! calls inc) (Thread/sleep 100) {:ready 1})]
+                   (let [chs (doall (repeatedly 3 #(k8s/get-deployment-status c)))]
+                     (is (= [{:ready 1} {:ready 1} {:ready 1}] (mapv async/<!! chs)))
+                     (is (= 1 @calls)))))))
+
+(deftest test-restart-deployment-clears-status-cache
+  (testing "a successful restart drops the cached deployment status"
+    (let [c (k8s/create-client "default" "ark-server" "ark-service")]
+      (reset! (:status-cache c) {:status {:ready 1 :available? true} :fetched-at 1000})
+      (with-redefs [k8s/execute-patch (fn [_client _token _patch] {:status 200})]
+                   (is (= {:success true} (async/<!! (k8s/restart-deployment c))))
+                   (is (nil? @(:status-cache c)))))))
+
+(deftest test-restart-timestamp
+  (testing "restart-timestamp is RFC 3339 with second precision"
+    (is (re-matches #"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z"
+                    (#'k8s/restart-timestamp)))))
+
+(deftest test-build-restart-patch
+  (testing "build-restart-patch with a pinned clock is a fixed payload"
+    (let [instant (Instant/parse "2024-01-01T00:00:00.123Z")]
+      (is (= "2024-01-01T00:00:00Z" (#'k8s/restart-timestamp instant)))
+      (is (= {:spec {:template {:metadata {:annotations
+                                           {"kubectl.kubernetes.io/restartedAt"
+                                            "2024-01-01T00:00:00Z"}}}}}
+             (#'k8s/build-restart-patch (#'k8s/restart-timestamp instant)))))))
+
 (deftest test-is-transient-error?
   (testing "is-transient-error? detects etcd errors"
     (is (k8s/is-transient-error?
@@ -50,6 +152,3 @@
   (testing "is-transient-error? returns false for other errors"
     (is (false? (k8s/is-transient-error?
                  (ex-info "error" {:body "not found"}))))))
-
-;; Run tests when loaded
-(clojure.test/run-tests 'ark-discord-bot.effects.kubernetes-test)
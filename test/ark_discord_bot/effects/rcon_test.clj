@@ -1,7 +1,59 @@
 (ns ark-discord-bot.effects.rcon-test
     "Tests for RCON client."
     (:require [ark-discord-bot.effects.rcon :as rcon]
-              [clojure.test :refer [deftest is testing]]))
+              [ark-discord-bot.rcon.protocol :as protocol]
+              [clojure.core.async :as async]
+              [clojure.test :refer [deftest is testing]])
+    (:import [java.io DataInputStream OutputStream]
+             [java.net ServerSocket Socket]))
+
+(def ^:private fake-players "0. Player, 123")
+
+(defn- read-request
+  "Read one size-prefixed RCON packet from a client."
+  [^DataInputStream in]
+  (let [data (byte-array (Integer/reverseBytes (.readInt in)))]
+    (.readFully in data)
+    (protocol/unpack-response data)))
+
+(defn- echo-reply
+  "Answer a request with fake-players, echoing its id."
+  [id]
+  [[id fake-players]])
+
+(defn- write-replies
+  "Write [id body] response packets and flush them."
+  [^OutputStream out replies]
+  (doseq [[id body] replies]
+    (.write out ^bytes (protocol/pack-packet id protocol/SERVERDATA_RESPONSE_VALUE body)))
+  (.flush out))
+
+(defn- serve-connection
+  "Answer every packet on a connection (auth included) with the [id body]
+   replies returned by respond, until the client disconnects or respond
+   returns :close."
+  [^Socket socket respond]
+  (with-open [socket socket]
+    (let [in (DataInputStream. (.getInputStream socket))
+          out (.getOutputStream socket)]
+      (loop []
+        (let [replies (respond (:id (read-request in)))]
+          (when-not (= :close replies)
+            (write-replies out replies)
+            (recur)))))))
+
+(defn- start-fake-rcon
+  "Accept connections on server until it is closed, counting them in accepts."
+  ([server accepts] (start-fake-rcon server accepts echo-reply))
+  ([^ServerSocket server accepts respond]
+   (future
+    (try
+      (loop []
+        (let [socket (.accept server)]
+          (swap! accepts inc)
+          (future (try (serve-connection socket respond) (catch Exception _ nil)))
+          (recur)))
+      (catch Exception _ nil)))))
 
 (deftest test-create-client
   (testing "create-client returns client map"
@@ -9,13 +61,109 @@
       (is (= "localhost" (:host c)))
       (is (= 27020 (:port c)))
       (is (= "password" (:password c)))
-      (is (nil? (:socket c))))))
+      (is (nil? (:socket c)))
+      (is (nil? @(:conn c)))
+      (is (= (seq (protocol/pack-packet 1 protocol/SERVERDATA_AUTH "password"))
+             (seq (:auth-packet c)))))))
 
 (deftest test-connected?-false-when-no-socket
   (testing "connected? returns false when no socket"
     (let [c (rcon/create-client "localhost" 27020 "password")]
       (is (false? (rcon/connected? c))))))
 
+(deftest test-close!-without-connection
+  (testing "close! is safe when no connection was ever opened"
+    (let [c (rcon/create-client "localhost" 27020 "password")]
+      (rcon/close! c)
+      (is (nil? @(:conn c))))))
+
+(deftest test-open-socket-options
+  (testing "open-socket disables Nagle and applies the read timeout"
+    (with-open [server (ServerSocket. 0)
+                socket (#'rcon/open-socket {:host "127.0.0.1" :port (.getLocalPort server)}
+                                           1500)]
+      (is (.getTcpNoDelay socket))
+      (is (= 1500 (.getSoTimeout socket))))))
+
+(deftest test-execute-persistent-reuses-connection
+  (testing "repeated commands share one authenticated connection"
+    (let [accepts (atom 0)]
+      (with-open [server (ServerSocket. 0)]
+        (start-fake-rcon server accepts)
+        (let [c (rcon/create-client "127.0.0.1" (.getLocalPort server) "password")]
+          (dotimes [_ 3]
+                   (is (= fake-players (async/<!! (rcon/execute-persistent c "ListPlayers" 1000)))))
+          (is (= 1 @accepts))
+          (rcon/close! c))))))
+
+(deftest test-execute-persistent-accepts-packed-command
+  (testing "a pre-packed command is sent as-is"
+    (let [accepts (atom 0)]
+      (with-open [server (ServerSocket. 0)]
+        (start-fake-rcon server accepts)
+        (let [c (rcon/create-client "127.0.0.1" (.getLocalPort server) "password")
+              packet (rcon/pack-command "ListPlayers")]
+          (is (= fake-players (async/<!! (rcon/execute-persistent c packet 1000))))
+          (rcon/close! c))))))
+
+(deftest test-execute-persistent-uses-increasing-ids
+  (testing "each command on a connection gets the next request id"
+    (let [ids (atom [])
+          respond (fn [id] (swap! ids conj id) (echo-reply id))]
+      (with-open [server (ServerSocket. 0)]
+        (start-fake-rcon server (atom 0) respond)
+        (let [c (rcon/create-client "127.0.0.1" (.getLocalPort server) "password")]
+          (async/<!! (rcon/execute-persistent c "ListPlayers" 1000))
+          (async/<!! (rcon/execute-persistent c (rcon/pack-command "ListPlayers") 1000))
+          (is (= [1 2 3] @ids))
+          (rcon/close! c))))))
+
+(deftest test-execute-persistent-skips-late-replies
+  (testing "a late reply to the previous command is skipped"
+    (let [accepts (atom 0)
+          respond (fn [id] (concat (when (> id 2) [[(dec id) "late"]]) (echo-reply id)))]
+      (with-open [server (ServerSocket. 0)]
+        (start-fake-rcon server accepts respond)
+        (let [c (rcon/create-client "127.0.0.1" (.getLocalPort server) "password")]
+          (dotimes [_ 3]
+                   (is (= fake-players (async/<!! (rcon/execute-persistent c "ListPlayers" 1000)))))
+          (is (= 1 @accepts))
+          (rcon/close! c))))))
+
+(deftest test-execute-persistent-drops-out-of-step-connection
+  (testing "a connection whose replies never match the request id is dropped"
+    (let [respond (fn [id] (if (= 2 id) (repeat 9 [99 "stale"]) [[id ""]]))]
+      (with-open [server (ServerSocket. 0)]
+        (start-fake-rcon server (atom 0) respond)
+        (let [c (rcon/create-client "127.0.0.1" (.getLocalPort server) "password")]
+          (is (nil? (async/<!! (rcon/execute-persistent c "ListPlayers" 1000))))
+          (is (nil? @(:conn c))))))))
+
+(deftest test-execute-persistent-retries-closed-connection
+  (testing "a reused connection closed before answering is replaced once"
+    (let [accepts (atom 0)
+          respond (fn [id] (if (= 3 id) :close (echo-reply id)))]
+      (with-open [server (ServerSocket. 0)]
+        (start-fake-rcon server accepts respond)
+        (let [c (rcon/create-client "127.0.0.1" (.getLocalPort server) "password")]
+          (dotimes [_ 2]
+                   (is (= fake-players (async/<!! (rcon/execute-persistent c "ListPlayers" 1000)))))
+          (is (= 2 @accepts))
+          (rcon/close! c))))))
+
+(deftest test-execute-persistent-does-not-retry-timeouts
+  (testing "a command that times out on a reused connection is not sent again"
+    (let [accepts (atom 0)
+          requests (atom [])
+          respond (fn [id] (swap! requests conj id) (when (< id 3) (echo-reply id)))]
+      (with-open [server (ServerSocket. 0)]
+        (start-fake-rcon server accepts respond)
+        (let [c (rcon/create-client "127.0.0.1" (.getLocalPort server) "password")]
+          (is (= fake-players (async/<!! (rcon/execute-persistent c "ListPlayers" 200))))
+          (is (nil? (async/<!! (rcon/execute-persistent c "ListPlayers" 200))))
+          (is (= 1 @accepts))
+          (is (= [1 2 3] @requests)))))))
+
 (deftest test-parse-listplayers-response
   (testing "parse-listplayers extracts player info"
     (let [response "0. PlayerOne, 76561198xxxxxx\n1. PlayerTwo, 76561198yyyyyy"
@@ -24,10 +172,14 @@
       (is (= "PlayerOne" (:name (first players))))
       (is (= "PlayerTwo" (:name (second players)))))))
 
+(deftest test-parse-listplayers-skips-other-lines
+  (testing "parse-listplayers ignores lines that are not player entries"
+    (is (= [{:name "Player One" :steam-id "123"}
+            {:name "PlayerTwo" :steam-id "456"}]
+           (rcon/parse-listplayers
+            "0. Player One, 123\r\nnot a player\n\n1. PlayerTwo, 456 \n")))))
+
 (deftest test-parse-listplayers-empty
   (testing "parse-listplayers handles empty/no-players"
     (is (empty? (rcon/parse-listplayers "")))
     (is (empty? (rcon/parse-listplayers "No Players Connected")))))
-
-;; Run tests when loaded
-(clojure.test/run-tests 'ark-discord-bot.effects.rcon-test)
@@ -0,0 +1,103 @@
+(ns ark-discord-bot.effects.server-status-test
+    "Tests for shared server status checks."
+    (:require [ark-discord-bot.effects.kubernetes :as k8s]
+              [ark-discord-bot.effects.rcon :as rcon]
+              [ark-discord-bot.effects.server-status :as server-status]
+              [clojure.core.async :as async]
+              [clojure.test :refer [deftest is testing]])
+    (:import [java.net ServerSocket]))
+
+(defn- closed-port
+  "Return a local port with nothing listening on it."
+  []
+  (with-open [s (ServerSocket. 0)]
+    (.getLocalPort s)))
+
+(def ^:private pods-available {:available? true :ready 1})
+
+(def ^:private pods-unavailable {:available? false :ready 0})
+
+(def ^:private players-online {:connected true :players []})
+
+(defn- with-stubs
+  "Call f with K8s and RCON stubbed: k8s-fn returns the deployment status
+   (nil for a failed request) and rcon-fn answers check-rcon-status."
+  [k8s-fn rcon-fn f]
+  (with-redefs [k8s/get-deployment-status (fn [_client _opts] (async/thread (k8s-fn)))
+                server-status/check-rcon-status (fn [_client _timeout-ms] (rcon-fn))]
+               (f)))
+
+(deftest test-check-rcon-status-unreachable
+  (testing "check-rcon-status reports connection failure"
+    (let [c (rcon/create-client "127.0.0.1" (closed-port) "password")
+          result (server-status/check-rcon-status c 1000)]
+      (is (false? (:connected result)))
+      (is (string? (:error result))))))
+
+(deftest test-check-status-skips-rcon-when-not-available
+  (testing "check-status does not contact RCON when pods are not available"
+    (let [rcon-called (atom false)]
+      (with-stubs (constantly pods-unavailable)
+                  #(reset! rcon-called true)
+                  (fn []
+                    (is (= :not-ready (:status (server-status/check-status nil nil {}))))
+                    (is (false? @rcon-called)))))))
+
+(deftest test-check-status-caches-rcon
+  (testing "check-status reuses a recent RCON result unless forced"
+    (let [c (rcon/create-client "127.0.0.1" 27020 "password")
+          calls (atom 0)]
+      (with-stubs (constantly pods-available)
+                  #(do (swap! calls inc) players-online)
+                  (fn []
+                    (is (= :running (:status (server-status/check-status nil c {}))))
+                    (is (= :running (:status (server-status/check-status nil c {}))))
+                    (is (= 1 @calls))
+                    (server-status/check-status nil c {} {:force? true})
+                    (is (= 2 @calls)))))))
+
+(deftest ^:slow test-check-status-coalesces-rcon
+  (testing "concurrent check-status calls share one RCON probe"
+    (let [c (rcon/create-client "127.0.0.1" 27020 "password")
+          calls (atom 0)]
+      (with-stubs (constantly pods-available)
+                  #(do (swap! calls inc) (Thread/sleep 100) players-online)
+                  (fn []
+                    (let [check #(future (server-status/check-status nil c {}))
+                          results (doall (repeatedly 3 check))]
+                      (is (= [:running :running :running] (mapv (comp :status deref) results)))
+                      (is (= 1 @calls))))))))
+
+(deftest test-check-status-eager-rcon-overlaps-k8s
+  (testing "with :eager-rcon? the RCON probe starts before K8s answers"
+    (let [c (rcon/create-client "127.0.0.1" 27020 "password")
+          rcon-started (promise)]
+      (with-stubs #(assoc pods-available :rcon-started? (deref rcon-started 1000 false))
+                  #(do (deliver rcon-started true) players-online)
+                  (fn []
+                    (let [result (server-status/check-status nil c {} {:eager-rcon? true})]
+                      (is (= :running (:status result)))
+                      (is (true? (:rcon-started? (:k8s result))))))))))
+
+(deftest test-check-status-ignores-unused-eager-probe
+  (testing "check-status does not wait on an eager probe when pods are unavailable"
+    (let [c (rcon/create-client "127.0.0.1" 27020 "password")
+          probing (promise)
+          release (promise)
+          finished (atom false)]
+      (with-stubs #(do (deref probing 1000 nil) pods-unavailable)
+                  #(do (deliver probing true)
+                       (deref release 5000 nil)
+                       (reset! finished true)
+                       players-online)
+                  (fn []
+                    (is (= :not-ready (:status (server-status/check-status
+                                                nil c {} {:eager-rcon? true}))))
+                    (is (false? @finished))
+                    (deliver release true))))))
+
+(deftest test-check-status-error-when-k8s-fails
+  (testing "check-status reports :error when the K8s request fails"
+    (with-stubs (constantly nil)
+                (constantly players-online)
+                #(is (= :error (:status (server-status/check-status nil nil {})))))))
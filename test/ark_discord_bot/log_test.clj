@@ -0,0 +1,14 @@
+(ns ark-discord-bot.log-test
+    "Tests for the asynchronous logger."
+    (:require [ark-discord-bot.log :as log]
+              [clojure.test :refer [deftest is testing]]))
+
+(deftest test-format-line
+  (testing "format-line prefixes the level"
+    (is (= "[info] hello" (log/format-line :info "hello")))
+    (is (= "[warn] careful" (log/format-line :warn "careful")))))
+
+(deftest test-log-returns-immediately
+  (testing "log queues the line and flush! waits for it"
+    (is (nil? (log/log :debug "queued")))
+    (is (true? (log/flush!)))))
@@ -3,6 +3,10 @@
     (:require [ark-discord-bot.rcon.protocol :as protocol]
               [clojure.test :refer [deftest is testing]]))
 
+(def ^:private ok-response
+     "Response frame without size prefix: ID=1, Type=0, Body=\"OK\", two nulls."
+     (byte-array [1 0 0 0 0 0 0 0 79 75 0 0]))
+
 (deftest test-pack-packet
   (testing "pack-packet creates correct little-endian structure"
     (let [packet (protocol/pack-packet 1 3 "test")]
@@ -19,19 +23,38 @@
       ;; Size = 4 + 4 + 0 + 2 = 10
       (is (= 14 (count packet))))))
 
+(deftest test-with-request-id
+  (testing "with-request-id replaces the id in a copy of the packet"
+    (let [packet (protocol/pack-packet 2 protocol/SERVERDATA_EXECCOMMAND "ListPlayers")
+          copy (protocol/with-request-id packet 7)]
+      (is (= (seq (protocol/pack-packet 7 protocol/SERVERDATA_EXECCOMMAND "ListPlayers"))
+             (seq copy)))
+      (is (= 2 (protocol/read-int-le (byte-array (take 4 (drop 4 packet)))))))))
+
 (deftest test-unpack-response
   (testing "unpack-response extracts id, type, and body"
-    ;; Create a valid response packet (without size prefix)
-    ;; ID=1 (little-endian), Type=0 (little-endian), Body="OK", nulls
-    (let [data (byte-array [1 0 0 0   ;; ID = 1
-                            0 0 0 0   ;; Type = 0
-                            79 75     ;; "OK"
-                            0 0])     ;; Null terminators
-          response (protocol/unpack-response data)]
+    (let [response (protocol/unpack-response ok-response)]
       (is (= 1 (:id response)))
       (is (= 0 (:type response)))
       (is (= "OK" (:body response))))))
 
+(deftest test-unpack-response-with-length
+  (testing "unpack-response ignores bytes past length in a reused buffer"
+    (let [data (byte-array (concat ok-response [99 99 99]))]
+      (is (= "OK" (:body (protocol/unpack-response data 12)))))))
+
+(deftest test-unpack-response-too-short
+  (testing "unpack-response rejects data shorter than a packet"
+    (is (thrown-with-msg? clojure.lang.ExceptionInfo
+                          #"too short"
+                          (protocol/unpack-response (byte-array [1 0 0 0 0 0]))))))
+
+(deftest test-read-int-le
+  (testing "read-int-le decodes little-endian ints, including negatives"
+    (is (= 14 (protocol/read-int-le (byte-array [14 0 0 0]))))
+    (is (= 0x04030201 (protocol/read-int-le (byte-array [1 2 3 4]))))
+    (is (= -1 (protocol/read-int-le (byte-array [-1 -1 -1 -1]))))))
+
 (deftest test-packet-types
   (testing "packet type constants are correct"
     (is (= 3 protocol/SERVERDATA_AUTH))
@@ -48,7 +71,11 @@
 (deftest test-decode-body-handles-encoding
   (testing "decode-body handles different encodings"
     (let [data (.getBytes "hello" "UTF-8")]
-      (is (= "hello" (protocol/decode-body data))))))
+      (is (= "hello" (protocol/decode-body data)))
+      (is (= "ell" (protocol/decode-body data 1 3))))))
 
-;; Run tests when loaded
-(clojure.test/run-tests 'ark-discord-bot.rcon.protocol-test)
+(deftest test-decode-body-skips-bom
+  (testing "decode-body drops a leading UTF-8 byte order mark"
+    (let [data (byte-array (concat [0xEF 0xBB 0xBF] (.getBytes "0. Player, 1" "UTF-8")))]
+      (is (= "0. Player, 1" (protocol/decode-body data)))
+      (is (= "Player" (protocol/decode-body data 6 6))))))
@@ -0,0 +1,77 @@
+(ns ark-discord-bot.system.gateway-event-loop-test
+    "Tests for the gateway event loop component."
+    (:require [ark-discord-bot.effects.discord :as discord]
+              [ark-discord-bot.effects.kubernetes :as k8s]
+              [ark-discord-bot.system.gateway-event-loop :as event-loop]
+              [clojure.core.async :as async]
+              [clojure.test :refer [deftest is testing]]))
+
+(def ^:private restart-message
+     {:type :message
+      :data {:content "!ark restart" :channel_id "channel" :author {:bot false}}})
+
+(defn- button-click
+  "INTERACTION_CREATE event for a click on the button with custom-id."
+  [custom-id]
+  {:type :interaction
+   :data {:type 3 :id "interaction-id" :token "interaction-token"
+          :data {:custom_id custom-id}}})
+
+(defn- test-monitor-loop
+  "Monitor loop handle with a backed-off state and an empty wake channel."
+  []
+  {:monitor-state (atom {:last-status :running :stable-count 4})
+   :wake-chan (async/chan (async/sliding-buffer 1))})
+
+(defn- with-stubbed-effects
+  "Call f with Discord and the K8s restart stubbed, recording their calls
+   in the calls atom. The restart returns restart-result."
+  [calls restart-result f]
+  (let [record (fn [call result] (swap! calls conj call) (async/to-chan! [result]))]
+    (with-redefs [discord/send-restart-confirmation
+                  (fn [_client _channel-id] (record :confirmation {:status 200}))
+                  discord/respond-to-interaction
+                  (fn [_token _id _interaction-token response]
+                    (record [:respond (get-in response [:data :content])] {:status 200}))
+                  k8s/restart-deployment (fn [_client] (record :restart restart-result))]
+                 (f))))
+
+(defn- dispatch-events
+  "Dispatch gateway events with effects stubbed (see with-stubbed-effects).
+   Returns the recorded calls and the monitor loop the events were given."
+  [events restart-result]
+  (let [calls (atom [])
+        clients {:discord-client {} :k8s-client {} :monitor-loop (test-monitor-loop)}
+        dispatch #(#'event-loop/dispatch-gateway-event % clients {:discord-token "token"})]
+    (with-stubbed-effects calls restart-result #(run! dispatch events))
+    {:calls @calls :monitor-loop (:monitor-loop clients)}))
+
+(deftest test-restart-command-asks-for-confirmation
+  (testing "!ark restart only shows the confirmation buttons"
+    (is (= [:confirmation] (:calls (dispatch-events [restart-message] {:success true}))))))
+
+(deftest test-restart-flow
+  (testing "confirming restarts the server"
+    (is (= [:confirmation [:respond "Restarting ARK server..."] :restart]
+           (:calls (dispatch-events [restart-message (button-click "restart_confirm")]
+                                    {:success true})))))
+  (testing "cancelling does not"
+    (is (= [:confirmation [:respond "ARK server restart cancelled."]]
+           (:calls (dispatch-events [restart-message (button-click "restart_cancel")]
+                                    {:success true}))))))
+
+(deftest test-restart-confirm-requests-fast-polling
+  (testing "a successful restart resets the monitor backoff and wakes the loop"
+    (let [{:keys [monitor-loop]} (dispatch-events [(button-click "restart_confirm")]
+                                                  {:success true})
+          {:keys [monitor-state wake-chan]} monitor-loop]
+      (is (= 0 (:stable-count @monitor-state)))
+      (is (= :wake (async/poll! wake-chan))))))
+
+(deftest test-restart-confirm-failure-leaves-monitor-alone
+  (testing "a failed restart neither resets the backoff nor wakes the loop"
+    (let [failure {:error (ex-info "Failed to restart deployment" {:status 500})}
+          {:keys [monitor-loop]} (dispatch-events [(button-click "restart_confirm")] failure)
+          {:keys [monitor-state wake-chan]} monitor-loop]
+      (is (= 4 (:stable-count @monitor-state)))
+      (is (nil? (async/poll! wake-chan))))))
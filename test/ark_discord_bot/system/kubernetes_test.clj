@@ -3,12 +3,14 @@
               [clojure.test :refer [deftest is testing]]
               [integrant.core :as ig]))
 
+(def ^:private k8s-config
+     {:k8s-namespace "test-ns"
+      :k8s-deployment "test-deployment"
+      :k8s-service "test-service"})
+
 (deftest init-key-ark-k8s-client-test
   (testing ":ark/k8s-client creates client with config"
-    (let [config {:k8s-namespace "test-ns"
-                  :k8s-deployment "test-deployment"
-                  :k8s-service "test-service"}
-          client (ig/init-key :ark/k8s-client {:config config})]
+    (let [client (ig/init-key :ark/k8s-client {:config k8s-config})]
       (is (map? client))
       (is (= "test-ns" (:namespace client)))
       (is (= "test-deployment" (:deployment client)))
@@ -18,9 +20,6 @@
 
 (deftest halt-key-ark-k8s-client-test
   (testing ":ark/k8s-client halt closes http-client"
-    (let [config {:k8s-namespace "test-ns"
-                  :k8s-deployment "test-deployment"
-                  :k8s-service "test-service"}
-          client (ig/init-key :ark/k8s-client {:config config})]
+    (let [client (ig/init-key :ark/k8s-client {:config k8s-config})]
       ;; Should not throw when halting (even if http-client is nil)
       (is (nil? (ig/halt-key! :ark/k8s-client client))))))
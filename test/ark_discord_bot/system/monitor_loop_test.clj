@@ -0,0 +1,85 @@
+(ns ark-discord-bot.system.monitor-loop-test
+    "Tests for the monitor loop component."
+    (:require [ark-discord-bot.effects.discord :as discord]
+              [ark-discord-bot.effects.server-status :as server-status]
+              [ark-discord-bot.system.monitor-loop :as monitor-loop]
+              [clojure.core.async :as async]
+              [clojure.test :refer [deftest is testing]]
+              [integrant.core :as ig]))
+
+(def ^:private test-interval-ms
+     "Shortest interval validate-config accepts; only the first cycle runs
+   before each test halts the loop."
+     1000)
+
+(defn- init-test-loop
+  "Start the monitor loop with test-interval-ms and no previous status."
+  []
+  (ig/init-key :ark/monitor-loop
+               {:discord-client {} :k8s-client {} :rcon-client {}
+                :config {:monitor-interval test-interval-ms}
+                :monitor-state (atom {:last-status nil :failure-count 0
+                                      :stable-count 0 :failure-threshold 3})}))
+
+(deftest test-monitor-loop-runs-cycle
+  (testing "monitor loop runs one status check per interval"
+    (let [calls (atom 0)
+          checked (promise)]
+      (with-redefs [server-status/check-status
+                    (fn [_k8s _rcon _config _opts]
+                      (swap! calls inc)
+                      (deliver checked true)
+                      {:status :running})]
+                   (let [loop-state (init-test-loop)]
+                     (is (true? (deref checked 3000 false)))
+                     (ig/halt-key! :ark/monitor-loop loop-state)
+                     (is (= 1 @calls)))))))
+
+(deftest test-halt-waits-for-running-cycle
+  (testing "halt-key! returns only after the in-flight cycle has finished"
+    (let [started (promise)
+          finished (atom false)]
+      (with-redefs [server-status/check-status
+                    (fn [_k8s _rcon _config _opts]
+                      (deliver started true)
+                      (Thread/sleep 100)
+                      (reset! finished true)
+                      {:status :running})]
+                   (let [loop-state (init-test-loop)]
+                     (is (true? (deref started 3000 false)))
+                     (ig/halt-key! :ark/monitor-loop loop-state)
+                     (is (true? @finished)))))))
+
+(deftest test-outbox-overflow-drops-oldest
+  (testing "a full outbox evicts its oldest notification for the newest"
+    (let [outbox (async/chan 2)]
+      (doseq [status [:not-ready :starting :running]]
+        (#'monitor-loop/enqueue-notification! outbox [status "details"]))
+      (is (= [[:starting "details"] [:running "details"]]
+             [(async/poll! outbox) (async/poll! outbox)]))
+      (is (nil? (async/poll! outbox))))))
+
+(deftest test-notifier-keeps-order-and-survives-failed-send
+  (testing "notifications are sent in order and a throwing send does not stop the notifier"
+    (let [outbox (async/chan 4)
+          sent (atom [])
+          done (promise)]
+      (with-redefs [discord/send-status-message
+                    (fn [_client status _details]
+                      (when (= :error status) (throw (ex-info "Discord down" {})))
+                      (when (= 2 (count (swap! sent conj status))) (deliver done true))
+                      (async/to-chan! [{:status 200}]))]
+                   (#'monitor-loop/start-notifier {} outbox)
+                   (doseq [status [:error :not-ready :running]]
+                     (async/>!! outbox [status "details"]))
+                   (is (true? (deref done 1000 false)))
+                   (is (= [:not-ready :running] @sent)))
+      (async/close! outbox))))
+
+(deftest test-request-fast-polling
+  (testing "request-fast-polling! resets backoff and wakes the loop"
+    (let [state (atom {:last-status :running :stable-count 4})
+          wake-chan (async/chan (async/sliding-buffer 1))]
+      (monitor-loop/request-fast-polling! {:monitor-state state :wake-chan wake-chan})
+      (is (= 0 (:stable-count @state)))
+      (is (= :wake (async/poll! wake-chan))))))
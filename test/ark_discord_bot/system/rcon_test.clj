@@ -3,13 +3,21 @@
               [clojure.test :refer [deftest is testing]]
               [integrant.core :as ig]))
 
+(def ^:private rcon-config
+     {:rcon-host "test-host"
+      :rcon-port 12345
+      :rcon-password "test-password"})
+
 (deftest init-key-ark-rcon-client-test
   (testing ":ark/rcon-client creates client with config"
-    (let [config {:rcon-host "test-host"
-                  :rcon-port 12345
-                  :rcon-password "test-password"}
-          client (ig/init-key :ark/rcon-client {:config config})]
+    (let [client (ig/init-key :ark/rcon-client {:config rcon-config})]
       (is (map? client))
       (is (= "test-host" (:host client)))
       (is (= 12345 (:port client)))
       (is (= "test-password" (:password client))))))
+
+(deftest halt-key-ark-rcon-client-test
+  (testing ":ark/rcon-client halt closes the persistent connection"
+    (let [client (ig/init-key :ark/rcon-client {:config rcon-config})]
+      (ig/halt-key! :ark/rcon-client client)
+      (is (nil? @(:conn client))))))